@@ -0,0 +1,412 @@
+"""
+Benchmarks of every stage of Transcribr on synthetic media.
+
+Run from the repository root, e.g.:
+
+    python -m benchmarks.run --output results.json
+    python -m benchmarks.run --only probe,subtitles --compare results.json
+
+Synthetic media is generated locally with FFmpeg's lavfi sources, so no downloads
+are needed apart from the Whisper model for the end-to-end benchmark.
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+from . import synthetic
+
+# Registered benchmarks by name, in execution order.
+BENCHMARKS = {}
+
+
+def benchmark(name):
+    """
+    Registers a benchmark function under the given name.
+
+    A benchmark function receives the parsed arguments and the generated media and
+    returns a list of result dictionaries.
+    """
+
+    def register(fn):
+        BENCHMARKS[name] = fn
+        return fn
+
+    return register
+
+
+def measure(fn, repeat=5, setup=None):
+    """
+    Measures the runtime of a function.
+
+    Args:
+        fn (Callable[[], Any]): The function to measure.
+        repeat (int): The number of measurements.
+        setup (Callable[[], Any], optional): A function called before every measurement.
+
+    Returns:
+        dict: The minimum, median and mean runtime in seconds and the number of repeats.
+    """
+    times = []
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return {
+        "min": min(times),
+        "median": statistics.median(times),
+        "mean": statistics.fmean(times),
+        "repeat": repeat,
+    }
+
+
+def generate_media(media_dir, quick=False):
+    """
+    Generates the synthetic media files used by the benchmarks.
+
+    Args:
+        media_dir (str): The directory to write the files to. Existing files are reused.
+        quick (bool): Whether to generate only short files.
+
+    Returns:
+        dict: The paths of the audio and video files by kind.
+    """
+    os.makedirs(media_dir, exist_ok=True)
+    lengths = [10, 60] if quick else [10, 60, 600]
+    audio = [
+        synthetic.generate_audio(
+            os.path.join(media_dir, f"audio_{length}s.{ext}"), length
+        )
+        for ext in synthetic.AUDIO_FORMATS
+        for length in lengths
+    ]
+    video = [
+        synthetic.generate_video(
+            os.path.join(media_dir, f"video_{length}s.{ext}"), length
+        )
+        for ext in synthetic.VIDEO_FORMATS
+        for length in lengths
+    ]
+    return {"audio": audio, "video": video}
+
+
+@benchmark("probe")
+def bench_probe(args, media):
+    from transcribr.media import clear_probe_cache
+    from transcribr.transcribr import Transcribr
+
+    # the model is never loaded, since probing does not need it
+    transcribr = Transcribr(model=args.model)
+    results = []
+    for path in media["audio"] + media["video"]:
+
+        def probe():
+            transcribr.is_video_file(path)
+            transcribr.is_audio_file(path)
+
+        for cache in ("cold", "warm"):
+            setup = clear_probe_cache if cache == "cold" else None
+            results.append(
+                {
+                    "case": f"{os.path.basename(path)}:{cache}",
+                    **measure(probe, args.repeat, setup),
+                }
+            )
+    return results
+
+
+@benchmark("extraction")
+def bench_extraction(args, media):
+    from transcribr.audio import load_audio
+    from transcribr.transcribr import Transcribr
+
+    results = []
+    with tempfile.TemporaryDirectory() as scratch_dir:
+        for path in media["video"]:
+            sizes = []
+
+            def extract():
+                audio_path = Transcribr.extract_audio_from_video(
+                    path, scratch_dir=scratch_dir
+                )
+                sizes.append(os.path.getsize(audio_path))
+                os.remove(audio_path)
+
+            results.append(
+                {
+                    "case": f"{os.path.basename(path)}:file",
+                    **measure(extract, args.repeat),
+                    "bytes": sizes[-1],
+                }
+            )
+            results.append(
+                {
+                    "case": f"{os.path.basename(path)}:memory",
+                    **measure(lambda: load_audio(path), args.repeat),
+                }
+            )
+    return results
+
+
+@benchmark("subtitles")
+def bench_subtitles(args, media):
+    from transcribr.transcribr import Transcribr
+
+    # the model is never loaded, since writing subtitles does not need it
+    transcribr = Transcribr(model=args.model)
+    counts = [1000, 10000] if args.quick else [1000, 10000, 100000]
+    results = []
+    for count in counts:
+        transcription = synthetic.generate_segments(count)
+        results.append(
+            {
+                "case": f"generate_srt:{count}",
+                **measure(lambda: transcribr.generate_srt(transcription), args.repeat),
+            }
+        )
+        seconds = [segment["start"] for segment in transcription["segments"]]
+        results.append(
+            {
+                "case": f"format_timedelta:{count}",
+                **measure(
+                    lambda: [Transcribr.format_timedelta(s) for s in seconds],
+                    args.repeat,
+                ),
+            }
+        )
+    return results
+
+
+def transcribe_case(name, transcribr, path, repeat, **options):
+    """
+    Measures an end-to-end transcription and reports its stage timings and real-time factor.
+
+    Args:
+        name (str): The name of the case.
+        transcribr (Transcribr): The loaded Transcribr instance.
+        path (str): The media file to transcribe.
+        repeat (int): The number of measurements.
+        **options: Further options passed to `transcribe`.
+
+    Returns:
+        dict: The timing results together with the stats of the last run.
+    """
+    timing = measure(lambda: transcribr.transcribe(path, **options), repeat)
+    stats = transcribr.last_run_stats
+    return {
+        "case": name,
+        **timing,
+        "audio_duration": stats.audio_duration,
+        "rtf": timing["median"] / stats.audio_duration,
+        "stages": stats.stages,
+    }
+
+
+@benchmark("transcribe")
+def bench_transcribe(args, media):
+    from transcribr.transcribr import Transcribr
+
+    transcribr = Transcribr(model=args.model)
+    transcribr.warmup()
+    results = []
+    for path in [media["audio"][0], media["video"][0]]:
+        for in_memory in (False, True):
+            transcribr.in_memory = in_memory
+            mode = "memory" if in_memory else "file"
+            results.append(
+                transcribe_case(
+                    f"{args.model}:{os.path.basename(path)}:{mode}",
+                    transcribr,
+                    path,
+                    args.repeat,
+                )
+            )
+        results.append(
+            transcribe_case(
+                f"{args.model}:{os.path.basename(path)}:batched",
+                transcribr,
+                path,
+                args.repeat,
+                batch_size=8,
+            )
+        )
+    return results
+
+
+@benchmark("quantize")
+def bench_quantize(args, media):
+    import difflib
+
+    from transcribr.registry import registry
+    from transcribr.transcribr import Transcribr
+
+    path = media["audio"][0]
+    results = []
+    texts = {}
+    for quantize in (None, "int8"):
+        name = quantize or "float32"
+        registry.clear()
+        start = time.perf_counter()
+        transcribr = Transcribr(model=args.model, device="cpu", quantize=quantize)
+        transcribr.warmup()
+        load_time = time.perf_counter() - start
+        result = transcribe_case(
+            f"{args.model}:{os.path.basename(path)}:{name}",
+            transcribr,
+            path,
+            args.repeat,
+        )
+        texts[name] = transcribr.transcription["text"]
+        # the agreement with the float32 transcript stands in for the accuracy,
+        # since synthetic media has no reference transcript
+        result.update(
+            load_time=load_time,
+            model_bytes=registry.memory_usage(),
+            agreement=difflib.SequenceMatcher(
+                None, texts["float32"], texts[name]
+            ).ratio(),
+        )
+        results.append(result)
+        transcribr.close()
+    return results
+
+
+@benchmark("presets")
+def bench_presets(args, media):
+    import difflib
+
+    from transcribr.presets import PRESETS
+    from transcribr.transcribr import Transcribr
+
+    path = media["audio"][0]
+    transcribr = Transcribr(model=args.model)
+    transcribr.warmup()
+    results = []
+    texts = {}
+    # the most accurate preset runs first, as the reference for the agreement of the others
+    for preset in reversed(list(PRESETS)):
+        result = transcribe_case(
+            f"{args.model}:{os.path.basename(path)}:{preset}",
+            transcribr,
+            path,
+            args.repeat,
+            preset=preset,
+        )
+        texts[preset] = transcribr.transcription["text"]
+        result["agreement"] = difflib.SequenceMatcher(
+            None, texts["accurate"], texts[preset]
+        ).ratio()
+        results.append(result)
+    return results
+
+
+def environment():
+    """
+    Describes the environment the benchmarks run in.
+
+    Returns:
+        dict: The commit, Python version, platform and number of CPUs.
+    """
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "commit": commit,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+    }
+
+
+def compare(results, baseline, threshold):
+    """
+    Compares the median runtimes with those of a previous run.
+
+    Args:
+        results (dict): The results of this run.
+        baseline (dict): The results of the previous run.
+        threshold (float): The slowdown ratio above which a case counts as a regression.
+
+    Returns:
+        list[str]: The cases that regressed.
+    """
+    previous = {(r["benchmark"], r["case"]): r["median"] for r in baseline["results"]}
+    regressions = []
+    for result in results["results"]:
+        key = (result["benchmark"], result["case"])
+        if key not in previous or not previous[key]:
+            continue
+        ratio = result["median"] / previous[key]
+        flag = "REGRESSION" if ratio > threshold else ""
+        print(f"{key[0]:<12} {key[1]:<40} {ratio:6.2f}x {flag}")
+        if ratio > threshold:
+            regressions.append(f"{key[0]}:{key[1]}")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--output", help="Write the results as JSON to this file.")
+    parser.add_argument(
+        "--only",
+        help=f"Comma-separated benchmarks to run. Options: {', '.join(BENCHMARKS)}.",
+    )
+    parser.add_argument("--model", default="tiny", help="The Whisper model to use.")
+    parser.add_argument("--repeat", type=int, default=5, help="Measurements per case.")
+    parser.add_argument(
+        "--media-dir",
+        default=os.path.join(tempfile.gettempdir(), "transcribr-benchmarks"),
+        help="Directory for the generated media, reused across runs.",
+    )
+    parser.add_argument("--quick", action="store_true", help="Use short inputs only.")
+    parser.add_argument("--compare", help="A previous JSON result to compare against.")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=1.2,
+        help="Slowdown ratio reported as a regression by --compare.",
+    )
+    args = parser.parse_args(argv)
+
+    names = args.only.split(",") if args.only else list(BENCHMARKS)
+    unknown = set(names) - set(BENCHMARKS)
+    if unknown:
+        parser.error(f"Unknown benchmarks: {', '.join(sorted(unknown))}")
+
+    media = generate_media(args.media_dir, args.quick)
+    results = {"environment": environment(), "results": []}
+    for name in names:
+        print(f"Running benchmark '{name}'...", file=sys.stderr)
+        for result in BENCHMARKS[name](args, media):
+            results["results"].append({"benchmark": name, **result})
+            print(
+                f"{name:<12} {result['case']:<40} {result['median'] * 1000:10.2f} ms",
+                file=sys.stderr,
+            )
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump(results, file, indent=2)
+
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as file:
+            baseline = json.load(file)
+        if compare(results, baseline, args.threshold):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,107 @@
+import os
+
+import ffmpeg
+
+# Audio codecs of the synthetic audio files by file extension.
+AUDIO_FORMATS = {
+    "wav": {"acodec": "pcm_s16le"},
+    "flac": {"acodec": "flac"},
+    "mp3": {"acodec": "libmp3lame"},
+    "m4a": {"acodec": "aac"},
+    "opus": {"acodec": "libopus"},
+}
+
+# Video and audio codecs of the synthetic video files by file extension.
+VIDEO_FORMATS = {
+    "mp4": {"vcodec": "libx264", "acodec": "aac", "pix_fmt": "yuv420p"},
+    "mkv": {"vcodec": "libx264", "acodec": "libopus", "pix_fmt": "yuv420p"},
+}
+
+
+def _audio_source(duration, sample_rate=48000):
+    # a tone mixed with pink noise, interrupted by a second of silence every ten seconds
+    tone = ffmpeg.input(
+        f"sine=frequency=220:sample_rate={sample_rate}:duration={duration}", f="lavfi"
+    )
+    noise = ffmpeg.input(
+        f"anoisesrc=color=pink:amplitude=0.05:sample_rate={sample_rate}:duration={duration}",
+        f="lavfi",
+    )
+    audio = ffmpeg.filter([tone, noise], "amix", inputs=2, normalize=0)
+    return audio.filter("volume", "if(lt(mod(t,10),9),1,0)", eval="frame")
+
+
+def generate_audio(path, duration, sample_rate=48000, channels=2):
+    """
+    Generates a synthetic audio file with FFmpeg's lavfi sources.
+
+    Args:
+        path (str): The output path. The codec is chosen by the extension, see AUDIO_FORMATS.
+        duration (float): The duration in seconds.
+        sample_rate (int): The sample rate of the file.
+        channels (int): The number of channels, 1 or 2.
+
+    Returns:
+        str: The path to the generated file.
+    """
+    if os.path.exists(path):
+        return path
+    codec = AUDIO_FORMATS[os.path.splitext(path)[1][1:]]
+    audio = _audio_source(duration, sample_rate)
+    ffmpeg.output(audio, path, ac=channels, **codec).run(
+        overwrite_output=True, quiet=True
+    )
+    return path
+
+
+def generate_video(path, duration, size="320x240", rate=25):
+    """
+    Generates a synthetic video file with an audio track using FFmpeg's lavfi sources.
+
+    Args:
+        path (str): The output path. The codecs are chosen by the extension, see VIDEO_FORMATS.
+        duration (float): The duration in seconds.
+        size (str): The frame size of the video.
+        rate (int): The frame rate of the video.
+
+    Returns:
+        str: The path to the generated file.
+    """
+    if os.path.exists(path):
+        return path
+    codecs = VIDEO_FORMATS[os.path.splitext(path)[1][1:]]
+    video = ffmpeg.input(
+        f"testsrc=size={size}:rate={rate}:duration={duration}", f="lavfi"
+    )
+    audio = _audio_source(duration)
+    ffmpeg.output(video, audio, path, ac=2, **codecs).run(
+        overwrite_output=True, quiet=True
+    )
+    return path
+
+
+def generate_segments(count, segment_length=2.5):
+    """
+    Generates a synthetic list of transcription segments.
+
+    Args:
+        count (int): The number of segments.
+        segment_length (float): The length of each segment in seconds.
+
+    Returns:
+        dict: A transcription with 'text' and 'segments' like the output of Whisper.
+    """
+    segments = [
+        {
+            "id": i,
+            "start": i * segment_length,
+            "end": (i + 1) * segment_length - 0.1,
+            "text": f" This is synthetic segment number {i}. Is it? Yes!",
+        }
+        for i in range(count)
+    ]
+    return {
+        "text": "".join(s["text"] for s in segments),
+        "segments": segments,
+        "language": "en",
+    }
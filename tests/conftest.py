@@ -0,0 +1,76 @@
+import types
+
+import pytest
+
+import transcribr.transcribr as module
+from transcribr import Transcribr
+from transcribr.budget import RtfHistory
+
+SAMPLE_RATE = 16000
+
+
+class FakeModel:
+    """
+    Records the options of every call and transcribes each chunk into one segment.
+
+    The text of the segment is `text`, or `text(call, audio, options)` if it is callable,
+    where `call` counts the calls from 1.
+    """
+
+    def __init__(self, text=" a", fail_at=None):
+        self.calls = []
+        self.text = text
+        self.fail_at = fail_at
+
+    def __call__(self, audio, **options):
+        self.calls.append(options)
+        if len(self.calls) == self.fail_at:
+            raise RuntimeError("crash")
+        text = (
+            self.text(len(self.calls), audio, options)
+            if callable(self.text)
+            else self.text
+        )
+        return {
+            "text": text,
+            "segments": [{"start": 0.0, "end": len(audio) / SAMPLE_RATE, "text": text}],
+            "language": options.get("language") or "en",
+        }
+
+
+@pytest.fixture
+def file_path(tmp_path):
+    path = tmp_path / "clip.wav"
+    path.write_bytes(b"audio")
+    return str(path)
+
+
+@pytest.fixture
+def transcriber(monkeypatch):
+    """
+    Returns a factory of instances that transcribe `audio` with a `FakeModel`.
+
+    The audio is read in blocks of one second, and the real-time factors are recorded
+    into a fresh history, so tests neither load models nor affect each other's plans.
+    """
+    monkeypatch.setattr(module, "rtf_history", RtfHistory())
+
+    def transcriber(audio, text=" a", fail_at=None, **options):
+        transcribr = Transcribr(**options)
+        monkeypatch.setattr(transcribr, "warmup", lambda: None)
+        monkeypatch.setattr(transcribr, "_transcribe_audio", FakeModel(text, fail_at))
+        monkeypatch.setattr(
+            transcribr,
+            "probe_supported",
+            lambda path: types.SimpleNamespace(duration=len(audio) / SAMPLE_RATE),
+        )
+        monkeypatch.setattr(
+            module,
+            "iter_audio",
+            lambda path, **options: (
+                audio[i : i + SAMPLE_RATE] for i in range(0, len(audio), SAMPLE_RATE)
+            ),
+        )
+        return transcribr
+
+    return transcriber
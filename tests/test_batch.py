@@ -0,0 +1,19 @@
+import os
+
+from transcribr.batch import expand_paths, missing_paths
+
+
+def test_missing_paths_reports_nonexistent_files(tmp_path):
+    existing = tmp_path / "clip.mp4"
+    existing.touch()
+    missing = str(tmp_path / "does_not_exist.mp4")
+
+    assert missing_paths([str(existing), str(tmp_path), missing]) == [missing]
+    assert missing_paths(missing) == [missing]
+
+
+def test_missing_paths_accepts_glob_patterns_without_matches(tmp_path):
+    pattern = os.path.join(tmp_path, "*.mkv")
+
+    assert expand_paths(pattern) == []
+    assert missing_paths(pattern) == []
@@ -0,0 +1,98 @@
+import numpy as np
+import pytest
+
+import transcribr.transcribr as module
+from transcribr.budget import PRIOR_RTF, RtfHistory, plan
+
+SAMPLE_RATE = 16000
+
+
+def test_plan_keeps_preferred_model_and_preset_within_budget():
+    history = RtfHistory()
+
+    assert plan(600, 1000, "small", "cpu", None, history) == (
+        "small",
+        None,
+        PRIOR_RTF["small"],
+    )
+
+
+def test_plan_prefers_faster_presets_before_smaller_models():
+    history = RtfHistory()
+    history.record("small", "cpu", "accurate", 1.0)
+    history.record("small", "cpu", "balanced", 0.1)
+
+    # the default decoding is estimated from the measured accurate preset
+    assert plan(100, 50, "small", "cpu", "accurate", history)[:2] == (
+        "small",
+        "balanced",
+    )
+
+
+def test_plan_falls_back_to_smaller_models():
+    history = RtfHistory()
+    history.record("small", "cpu", "fastest", 1.0)
+    history.record("base", "cpu", "fastest", 0.1)
+
+    assert plan(100, 50, "small", "cpu", None, history)[:2] == ("base", "fastest")
+
+
+def test_plan_returns_fastest_candidate_if_nothing_fits():
+    assert plan(3600, 1, "base", "cpu", None, RtfHistory())[:2] == ("tiny", "fastest")
+
+
+def test_rtf_history_moving_average():
+    history = RtfHistory(smoothing=0.5)
+    history.record("base", "cpu", None, 1.0)
+    history.record("base", "cpu", None, 0.5)
+
+    assert history.estimate("base", "cpu", None) == pytest.approx(0.75)
+    # devices are measured separately
+    assert history.estimate("base", "cuda", None) == PRIOR_RTF["base"]
+
+
+@pytest.fixture
+def planned(transcriber, monkeypatch):
+    audio = np.random.default_rng(0).uniform(-0.5, 0.5, 300 * SAMPLE_RATE)
+    audio = audio.astype(np.float32)
+
+    def planned(plan, **options):
+        monkeypatch.setattr(module, "plan", lambda *args: plan)
+        return transcriber(audio, **options)
+
+    return planned
+
+
+def test_deadline_uses_planned_default_preset(planned, file_path):
+    transcribr = planned(("base", None, 0.001), preset="accurate")
+
+    transcribr.transcribe(file_path, deadline=3600.0)
+
+    calls = transcribr._transcribe_audio.calls
+    assert calls
+    # Whisper's defaults, not the beam search of the accurate preset
+    assert all("beam_size" not in call for call in calls)
+    assert transcribr.last_run_stats.preset is None
+    assert module.rtf_history._rtfs.keys() == {("base", "None", None)}
+
+
+def test_deadline_uses_planned_faster_preset(planned, file_path):
+    transcribr = planned(("base", "fastest", 0.001), preset="accurate")
+
+    transcribr.transcribe(file_path, deadline=3600.0)
+
+    calls = transcribr._transcribe_audio.calls
+    assert all(call["beam_size"] is None for call in calls)
+    assert all(call["temperature"] == 0.0 for call in calls)
+    assert module.rtf_history._rtfs.keys() == {("base", "None", "fastest")}
+
+
+def test_deadline_stops_before_first_chunk(planned, file_path):
+    transcribr = planned(("base", None, 100.0))
+
+    transcribr.transcribe(file_path, deadline=1.0)
+
+    assert transcribr._transcribe_audio.calls == []
+    assert transcribr.transcription["partial"] is True
+    assert transcribr.transcription["segments"] == []
+    assert transcribr.last_run_stats.audio_duration == 0.0
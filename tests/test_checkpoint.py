@@ -0,0 +1,114 @@
+import numpy as np
+import pytest
+
+from transcribr.checkpoint import Checkpoint
+
+SAMPLE_RATE = 16000
+
+
+def segment(start, end, text):
+    return {"start": start, "end": end, "text": text}
+
+
+def test_checkpoint_restores_recorded_chunks(tmp_path):
+    path = str(tmp_path / "clip.checkpoint")
+    checkpoint = Checkpoint(path, "key")
+    checkpoint.record([segment(0.0, 1.0, " a")], 16000, "en", " a")
+    checkpoint.record([segment(1.0, 2.0, " b")], 32000, "en", " b")
+    checkpoint.close()
+
+    checkpoint = Checkpoint(path, "key")
+    assert [s["text"] for s in checkpoint.segments] == [" a", " b"]
+    assert checkpoint.samples == 32000
+    assert checkpoint.language == "en"
+    assert checkpoint.prompt == " b"
+    checkpoint.close()
+
+
+def test_checkpoint_truncates_partially_written_record(tmp_path):
+    path = str(tmp_path / "clip.checkpoint")
+    checkpoint = Checkpoint(path, "key")
+    checkpoint.record([segment(0.0, 1.0, " a")], 16000, "en", " a")
+    checkpoint.close()
+    with open(path, "ab") as file:
+        file.write(b'{"segments": [{"start": 1.0, "en')
+
+    checkpoint = Checkpoint(path, "key")
+    assert checkpoint.samples == 16000
+    assert [s["text"] for s in checkpoint.segments] == [" a"]
+    # the next record replaces the partial one instead of being appended to it
+    checkpoint.record([segment(1.0, 2.0, " b")], 32000, "en", " b")
+    checkpoint.close()
+
+    checkpoint = Checkpoint(path, "key")
+    assert checkpoint.samples == 32000
+    assert [s["text"] for s in checkpoint.segments] == [" a", " b"]
+    checkpoint.close()
+
+
+def test_checkpoint_discards_stale_key(tmp_path):
+    path = str(tmp_path / "clip.checkpoint")
+    checkpoint = Checkpoint(path, "old")
+    checkpoint.record([segment(0.0, 1.0, " a")], 16000, "en", " a")
+    checkpoint.close()
+
+    checkpoint = Checkpoint(path, "new")
+    assert checkpoint.segments == []
+    assert checkpoint.samples == 0
+    assert checkpoint.language is None
+    checkpoint.close()
+
+    # the file now belongs to the new key
+    checkpoint = Checkpoint(path, "new")
+    assert checkpoint.samples == 0
+    checkpoint.close()
+
+
+def test_checkpoint_key_depends_on_options(tmp_path):
+    file_path = tmp_path / "clip.wav"
+    file_path.write_bytes(b"audio")
+
+    key = Checkpoint.key(str(file_path), "base", {"chunk_length": 30.0})
+    assert key == Checkpoint.key(str(file_path), "base", {"chunk_length": 30.0})
+    assert key != Checkpoint.key(str(file_path), "base", {"chunk_length": 60.0})
+    assert key != Checkpoint.key(str(file_path), "small", {"chunk_length": 30.0})
+
+
+def _audio():
+    # noise with short pauses, so chunks are split at varying silence boundaries
+    rng = np.random.default_rng(0)
+    audio = rng.uniform(-0.5, 0.5, 95 * SAMPLE_RATE).astype(np.float32)
+    for second in range(3, 95, 7):
+        audio[second * SAMPLE_RATE : second * SAMPLE_RATE + SAMPLE_RATE // 2] = 0.0
+    return audio
+
+
+def _text(call, audio, options):
+    # depends on the length of the chunk and the prompt, so a wrongly restored prompt shows
+    return f" {len(audio)}:{len(options.get('initial_prompt') or '')}"
+
+
+def test_resumed_transcription_is_identical_to_uninterrupted_run(
+    transcriber, file_path, tmp_path
+):
+    audio = _audio()
+    checkpoint = str(tmp_path / "clip.checkpoint")
+
+    reference = transcriber(audio, text=_text)
+    reference.transcribe(file_path, chunk_length=10.0, checkpoint=checkpoint)
+    expected = reference.transcription
+    chunks = len(reference._transcribe_audio.calls)
+    assert chunks > 5
+
+    crashing = transcriber(audio, text=_text, fail_at=4)
+    with pytest.raises(RuntimeError):
+        crashing.transcribe(file_path, chunk_length=10.0, checkpoint=checkpoint)
+    assert (tmp_path / "clip.checkpoint").exists()
+
+    resumed = transcriber(audio, text=_text)
+    resumed.transcribe(file_path, chunk_length=10.0, checkpoint=checkpoint)
+
+    assert resumed.transcription == expected
+    # only the chunks after the checkpoint are transcribed again
+    assert len(resumed._transcribe_audio.calls) == chunks - 3
+    assert not (tmp_path / "clip.checkpoint").exists()
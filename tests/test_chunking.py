@@ -0,0 +1,100 @@
+from transcribr.chunking import merge_transcriptions, shift_segments
+
+SAMPLE_RATE = 16000
+
+# two chunks of 10 seconds each
+CHUNKS = [(0, 10 * SAMPLE_RATE), (10 * SAMPLE_RATE, 20 * SAMPLE_RATE)]
+
+
+def segment(start, end, text):
+    return {"start": start, "end": end, "text": text}
+
+
+def test_merge_transcriptions_shifts_to_global_timeline():
+    results = [
+        {"segments": [segment(0.0, 4.0, " a")], "language": "en"},
+        {"segments": [segment(1.0, 3.0, " b")], "language": "de"},
+    ]
+
+    merged = merge_transcriptions(results, CHUNKS)
+
+    assert [(s["start"], s["end"]) for s in merged["segments"]] == [
+        (0.0, 4.0),
+        (11.0, 13.0),
+    ]
+    assert [s["id"] for s in merged["segments"]] == [0, 1]
+    assert merged["text"] == " a b"
+    assert merged["language"] == "en"
+
+
+def test_merge_transcriptions_dedupes_overlap_by_midpoint():
+    # with 1 second of overlap, the second chunk starts at 9 seconds
+    results = [
+        {
+            "segments": [
+                segment(0.0, 4.0, " a"),
+                # midpoint 10.25 lies in the second chunk
+                segment(9.5, 11.0, " overlap"),
+            ],
+            "language": "en",
+        },
+        {
+            "segments": [
+                # 9.5 to 11.0 on the global timeline, kept by this chunk
+                segment(0.5, 2.0, " overlap"),
+                segment(2.5, 5.0, " b"),
+            ],
+            "language": "en",
+        },
+    ]
+
+    merged = merge_transcriptions(results, CHUNKS, overlap=1.0)
+
+    assert [s["text"] for s in merged["segments"]] == [" a", " overlap", " b"]
+    assert [(s["start"], s["end"]) for s in merged["segments"]] == [
+        (0.0, 4.0),
+        (9.5, 11.0),
+        (11.5, 14.0),
+    ]
+
+
+def test_merge_transcriptions_drops_context_before_the_chunk():
+    # midpoint 9.25 lies in the first chunk, so the second chunk drops its copy
+    results = [
+        {"segments": [segment(8.5, 10.0, " a")], "language": "en"},
+        {"segments": [segment(0.0, 0.5, " a"), segment(1.5, 3.0, " b")]},
+    ]
+
+    merged = merge_transcriptions(results, CHUNKS, overlap=1.0)
+
+    assert [s["text"] for s in merged["segments"]] == [" a", " b"]
+
+
+def test_merge_transcriptions_keeps_segments_past_the_last_chunk():
+    results = [
+        {"segments": [], "language": "en"},
+        {"segments": [segment(9.0, 11.0, " tail")]},
+    ]
+
+    merged = merge_transcriptions(results, CHUNKS)
+
+    assert [(s["start"], s["end"]) for s in merged["segments"]] == [(19.0, 21.0)]
+
+
+def test_merge_transcriptions_without_results():
+    assert merge_transcriptions([], []) == {
+        "text": "",
+        "segments": [],
+        "language": None,
+    }
+
+
+def test_shift_segments_shifts_words_without_modifying_input():
+    segments = [{**segment(1.0, 2.0, " a"), "words": [{"start": 1.0, "end": 2.0}]}]
+
+    shifted = shift_segments(segments, 5.0)
+
+    assert (shifted[0]["start"], shifted[0]["end"]) == (6.0, 7.0)
+    assert shifted[0]["words"] == [{"start": 6.0, "end": 7.0}]
+    assert segments[0]["start"] == 1.0
+    assert segments[0]["words"][0]["start"] == 1.0
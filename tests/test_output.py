@@ -0,0 +1,50 @@
+import os
+
+from transcribr import Transcribr
+
+
+def test_output_file_defaults_to_input_name(tmp_path):
+    transcribr = Transcribr()
+    input_file = str(tmp_path / "clip.mp4")
+    assert transcribr.output_file(input_file) == str(tmp_path / "clip.txt")
+
+
+def test_output_file_bare_name_creates_no_directory(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    transcribr = Transcribr()
+    assert transcribr.output_file("clip.mp4", "clip.srt", ".srt") == "clip.srt"
+    assert os.listdir(tmp_path) == []
+
+
+def test_output_file_creates_parent_directory(tmp_path):
+    transcribr = Transcribr()
+    output_file = str(tmp_path / "out" / "nested" / "clip.txt")
+    assert transcribr.output_file("clip.mp4", output_file) == output_file
+    assert os.path.isdir(tmp_path / "out" / "nested")
+
+
+def test_transcribe_batch_relative_inputs_create_no_directory(tmp_path, monkeypatch):
+    import numpy as np
+
+    import transcribr.transcribr as module
+
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "clip.wav").touch()
+    transcribr = Transcribr()
+    transcription = {
+        "text": " Hello.",
+        "segments": [{"id": 0, "start": 0.0, "end": 1.0, "text": " Hello."}],
+        "language": "en",
+    }
+    monkeypatch.setattr(module, "load_audio", lambda path: np.zeros(16000, np.float32))
+    monkeypatch.setattr(transcribr, "probe_supported", lambda path: None)
+    monkeypatch.setattr(transcribr, "warmup", lambda: None)
+    monkeypatch.setattr(
+        transcribr, "_transcribe_audio", lambda audio, **options: transcription
+    )
+
+    results = transcribr.transcribe_batch("clip.wav")
+
+    assert results[0].error is None
+    assert results[0].outputs == ["clip.txt", "clip.srt"]
+    assert sorted(os.listdir(tmp_path)) == ["clip.srt", "clip.txt", "clip.wav"]
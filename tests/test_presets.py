@@ -0,0 +1,143 @@
+import asyncio
+
+import numpy as np
+import pytest
+
+import transcribr.transcribr as module
+from transcribr.presets import PRESETS, resolve_preset
+
+SAMPLE_RATE = 16000
+
+# 'language' and 'initial_prompt' are ordinary options of Whisper's transcribe
+DECODE_OPTIONS = {"language": "de", "initial_prompt": "Glossar", "beam_size": 2}
+
+
+def test_resolve_preset_layers_raw_options_over_preset():
+    options = resolve_preset("fastest", {"beam_size": 3})
+
+    assert options == {**PRESETS["fastest"], "beam_size": 3}
+    assert resolve_preset() == {}
+
+
+def test_resolve_preset_rejects_unknown_preset():
+    with pytest.raises(AssertionError):
+        resolve_preset("slowest")
+
+
+def test_presets_set_the_same_options():
+    keys = {frozenset(options) for options in PRESETS.values()}
+    assert len(keys) == 1
+
+
+@pytest.fixture
+def audio():
+    # 70 seconds of noise, so chunked paths transcribe several chunks
+    rng = np.random.default_rng(0)
+    return rng.uniform(-0.5, 0.5, 70 * SAMPLE_RATE).astype(np.float32)
+
+
+@pytest.fixture
+def transcribr(transcriber, monkeypatch, audio):
+    transcribr = transcriber(
+        audio,
+        text=lambda call, audio, options: f" {call}",
+        in_memory=True,
+        decode_options=DECODE_OPTIONS,
+    )
+    monkeypatch.setattr(module, "load_audio", lambda path, **options: audio)
+
+    async def aload_audio(path, **options):
+        return audio
+
+    monkeypatch.setattr(module, "aload_audio", aload_audio)
+    return transcribr
+
+
+def assert_options_passed(calls, chunked):
+    assert calls
+    assert all(call["language"] == "de" for call in calls)
+    assert all(call["beam_size"] == 2 for call in calls)
+    assert calls[0]["initial_prompt"] == "Glossar"
+    if chunked:
+        assert len(calls) > 1
+        # later chunks are prompted with the text of the previous chunk
+        assert [call["initial_prompt"] for call in calls[1:]] == [
+            f" {i}" for i in range(1, len(calls))
+        ]
+
+
+def test_sequential_path(transcribr, file_path):
+    transcribr.transcribe(file_path)
+
+    assert_options_passed(transcribr._transcribe_audio.calls, chunked=False)
+    assert transcribr.transcription["language"] == "de"
+
+
+def test_explicit_language_takes_precedence(transcribr, file_path):
+    transcribr.transcribe(file_path, language="fr")
+
+    assert transcribr._transcribe_audio.calls[0]["language"] == "fr"
+
+
+def test_options_of_the_call(transcribr, file_path):
+    transcribr.decode_options = {}
+    transcribr.transcribe(file_path, decode_options=DECODE_OPTIONS)
+
+    assert_options_passed(transcribr._transcribe_audio.calls, chunked=False)
+
+
+def test_checkpoint_path(transcribr, file_path):
+    transcribr.transcribe(file_path, chunk_length=20.0, checkpoint=True)
+
+    assert_options_passed(transcribr._transcribe_audio.calls, chunked=True)
+
+
+def test_iterator_path(transcribr, file_path):
+    list(transcribr.transcribe_iter(file_path, chunk_length=20.0))
+
+    assert_options_passed(transcribr._transcribe_audio.calls, chunked=True)
+
+
+def test_deadline_path(transcribr, file_path):
+    transcribr.transcribe(file_path, deadline=3600.0)
+
+    assert_options_passed(transcribr._transcribe_audio.calls, chunked=True)
+    assert "partial" not in transcribr.transcription
+
+
+def test_asyncio_path(transcribr, file_path):
+    asyncio.run(transcribr.atranscribe(file_path, chunk_length=20.0))
+
+    assert_options_passed(transcribr._transcribe_audio.calls, chunked=True)
+
+
+def test_parallel_path(transcribr, file_path, monkeypatch):
+    calls = []
+
+    def transcribe_parallel(audio, model, **options):
+        calls.append(options)
+        return {"text": "", "segments": [], "language": options["language"]}
+
+    monkeypatch.setattr(module, "transcribe_parallel", transcribe_parallel)
+    transcribr.transcribe(file_path, workers=2)
+
+    assert calls[0]["language"] == "de"
+    assert calls[0]["initial_prompt"] == "Glossar"
+    assert calls[0]["beam_size"] == 2
+
+
+def test_batched_path(transcribr, file_path, monkeypatch):
+    languages = []
+
+    class Engine:
+        def transcribe(self, audios):
+            return [{"text": "", "segments": [], "language": languages[0]}]
+
+    def batched_engine(batch_size, language=None):
+        languages.append(language)
+        return Engine()
+
+    monkeypatch.setattr(transcribr, "batched_engine", batched_engine)
+    transcribr.transcribe(file_path, batch_size=4)
+
+    assert languages == ["de"]
@@ -0,0 +1,131 @@
+import threading
+
+import numpy as np
+import pytest
+
+import transcribr.scheduler as module
+from transcribr.scheduler import ClipScheduler
+
+SAMPLE_RATE = 16000
+
+
+class FakeEngine:
+    """
+    Transcribes every clip into its length and records the batches.
+    """
+
+    def __init__(self):
+        self.batches = []
+
+    def transcribe(self, audios):
+        self.batches.append(len(audios))
+        return [
+            {"text": f" {len(a)}", "segments": [], "language": "en"} for a in audios
+        ]
+
+
+class FakeTranscribr:
+    """
+    Provides the engine and blocks probing of the clips in `blocked` until released.
+    """
+
+    def __init__(self):
+        self.engine = FakeEngine()
+        self.blocked = {}
+
+    def batched_engine(self, batch_size, language=None):
+        return self.engine
+
+    def probe_supported(self, file_path):
+        if file_path in self.blocked:
+            self.blocked[file_path].wait(5)
+        if file_path == "broken":
+            raise ValueError("Unsupported file type.")
+
+
+@pytest.fixture
+def transcribr(monkeypatch):
+    # the length of a clip is encoded in its name, e.g. '3' is 3 seconds long
+    monkeypatch.setattr(
+        module,
+        "load_audio",
+        lambda file_path: np.zeros(int(file_path) * SAMPLE_RATE, np.float32),
+    )
+    return FakeTranscribr()
+
+
+def close(scheduler):
+    # close in a thread, so a deadlock fails the test instead of hanging it
+    thread = threading.Thread(target=scheduler.close)
+    thread.start()
+    thread.join(5)
+    assert not thread.is_alive(), "close() deadlocked"
+
+
+def test_full_batch_is_dispatched(transcribr):
+    scheduler = ClipScheduler(transcribr, batch_size=2, max_wait=60)
+    futures = [scheduler.submit("1"), scheduler.submit("2")]
+
+    assert [f.result(timeout=5)["text"] for f in futures] == [" 16000", " 32000"]
+    assert transcribr.engine.batches == [2]
+    close(scheduler)
+
+
+def test_partial_batch_is_dispatched_after_max_wait(transcribr):
+    scheduler = ClipScheduler(transcribr, batch_size=8, max_wait=0.05)
+
+    assert scheduler.submit("1").result(timeout=5)["text"] == " 16000"
+    assert transcribr.engine.batches == [1]
+    close(scheduler)
+
+
+def test_decode_error_is_set_on_the_future(transcribr):
+    scheduler = ClipScheduler(transcribr, batch_size=2, max_wait=0.05)
+
+    with pytest.raises(ValueError):
+        scheduler.submit("broken").result(timeout=5)
+    assert scheduler.submit("1").result(timeout=5)["text"] == " 16000"
+    close(scheduler)
+
+
+def test_cancelled_clip_does_not_stop_the_scheduler(transcribr):
+    release = transcribr.blocked["1"] = threading.Event()
+    scheduler = ClipScheduler(transcribr, batch_size=2, max_wait=0.05, decode_workers=1)
+    first = scheduler.submit("1")
+    # the single decoder is busy with the first clip, so the second has not started
+    cancelled = scheduler.submit("2")
+    assert cancelled.cancel()
+    release.set()
+
+    assert first.result(timeout=5)["text"] == " 16000"
+    assert scheduler.submit("3").result(timeout=5)["text"] == " 48000"
+    assert cancelled.cancelled()
+    close(scheduler)
+
+
+def test_running_clip_cannot_be_cancelled(transcribr):
+    release = transcribr.blocked["1"] = threading.Event()
+    scheduler = ClipScheduler(transcribr, batch_size=2, max_wait=0.05)
+    future = scheduler.submit("1")
+    while not future.running():
+        threading.Event().wait(0.01)
+
+    assert not future.cancel()
+    release.set()
+    assert future.result(timeout=5)["text"] == " 16000"
+    close(scheduler)
+
+
+def test_cancelled_clips_release_their_slots(transcribr):
+    release = transcribr.blocked["1"] = threading.Event()
+    scheduler = ClipScheduler(
+        transcribr, batch_size=2, max_wait=0.05, decode_workers=1, max_pending=2
+    )
+    first = scheduler.submit("1")
+    for _ in range(3):
+        # submit blocks unless the slot of the cancelled clip is released
+        assert scheduler.submit("2").cancel()
+        release.set()
+
+    assert first.result(timeout=5)["text"] == " 16000"
+    close(scheduler)
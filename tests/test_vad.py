@@ -0,0 +1,75 @@
+import pytest
+
+from transcribr.vad import remap_segments
+
+SAMPLE_RATE = 16000
+
+# speech from 1 to 2 seconds and from 3 to 4 seconds, i.e. from 0 to 1 and 1 to 2 without silence
+REGIONS = [(1 * SAMPLE_RATE, 2 * SAMPLE_RATE), (3 * SAMPLE_RATE, 4 * SAMPLE_RATE)]
+
+
+def test_remap_segments_within_regions():
+    segments = [
+        {"start": 0.25, "end": 0.75, "text": " a"},
+        {"start": 1.25, "end": 1.75, "text": " b"},
+    ]
+
+    remapped = remap_segments(segments, REGIONS)
+
+    assert [(s["start"], s["end"]) for s in remapped] == [(1.25, 1.75), (3.25, 3.75)]
+    assert [s["text"] for s in remapped] == [" a", " b"]
+
+
+def test_remap_segments_on_region_boundary():
+    # an end on the boundary belongs to the region before it, a start to the region after it
+    segments = [
+        {"start": 0.5, "end": 1.0, "text": " a"},
+        {"start": 1.0, "end": 1.5, "text": " b"},
+    ]
+
+    remapped = remap_segments(segments, REGIONS)
+
+    assert [(s["start"], s["end"]) for s in remapped] == [(1.5, 2.0), (3.0, 3.5)]
+
+
+def test_remap_segments_across_region_boundary():
+    segments = [{"start": 0.5, "end": 1.5, "text": " a b"}]
+
+    remapped = remap_segments(segments, REGIONS)
+
+    assert (remapped[0]["start"], remapped[0]["end"]) == (1.5, 3.5)
+
+
+def test_remap_segments_words():
+    segments = [
+        {
+            "start": 0.5,
+            "end": 1.5,
+            "text": " a b",
+            "words": [
+                {"start": 0.5, "end": 1.0, "word": " a"},
+                {"start": 1.0, "end": 1.5, "word": " b"},
+            ],
+        }
+    ]
+
+    words = remap_segments(segments, REGIONS)[0]["words"]
+
+    assert [(w["start"], w["end"]) for w in words] == [(1.5, 2.0), (3.0, 3.5)]
+    # the input is not modified
+    assert segments[0]["words"][1]["start"] == 1.0
+
+
+def test_remap_segments_without_regions():
+    segments = [{"start": 0.5, "end": 1.5, "text": " a"}]
+
+    assert remap_segments(segments, []) == segments
+
+
+def test_remap_segments_with_leading_region_offset():
+    segments = [{"start": 0.0, "end": 0.5, "text": " a"}]
+
+    remapped = remap_segments(segments, [(8000, 16000)])
+
+    assert remapped[0]["start"] == pytest.approx(0.5)
+    assert remapped[0]["end"] == pytest.approx(1.0)
@@ -0,0 +1,172 @@
+import ffmpeg
+
+# Whisper operates on 16 kHz mono audio.
+SAMPLE_RATE = 16000
+
+
+def audio_input(file_path, stream_index=None, start=None, duration=None):
+    """
+    Opens an audio stream of a file as FFmpeg input.
+
+    The time range is applied as input options, so FFmpeg seeks to the start
+    instead of decoding and discarding everything before it.
+
+    Args:
+        file_path (str): The path to the audio or video file.
+        stream_index (int, optional): The index of the audio stream among the audio streams of the
+                                      file. If None, FFmpeg picks the best audio stream.
+        start (float, optional): The offset in seconds at which to start reading.
+        duration (float, optional): The maximum number of seconds to read.
+
+    Returns:
+        ffmpeg.nodes.FilterableStream: The selected audio stream.
+    """
+    kwargs = {"threads": 0}
+    if start is not None:
+        kwargs["ss"] = start
+    if duration is not None:
+        kwargs["t"] = duration
+    stream = ffmpeg.input(file_path, **kwargs)
+    if stream_index is not None:
+        stream = stream[f"a:{stream_index}"]
+    return stream
+
+
+def load_audio(
+    file_path, sample_rate=SAMPLE_RATE, stream_index=None, start=None, duration=None
+):
+    """
+    Decodes the audio track of a file straight into memory using FFmpeg.
+
+    FFmpeg's stdout is piped into a NumPy array, so no intermediate file is
+    written and the audio is decoded only once.
+
+    Args:
+        file_path (str): The path to the audio or video file.
+        sample_rate (int): The sample rate to resample the audio to.
+        stream_index (int, optional): The index of the audio stream to decode, see `audio_input`.
+        start (float, optional): The offset in seconds at which to start decoding.
+        duration (float, optional): The maximum number of seconds to decode.
+
+    Returns:
+        np.ndarray: The mono audio as a float32 array in the range [-1, 1].
+
+    Raises:
+        RuntimeError: If FFmpeg fails to decode the file.
+    """
+    import numpy as np
+
+    try:
+        out, _ = (
+            audio_input(file_path, stream_index, start, duration)
+            .output("-", format="f32le", acodec="pcm_f32le", ac=1, ar=sample_rate)
+            .run(capture_stdout=True, capture_stderr=True)
+        )
+    except ffmpeg.Error as e:
+        raise RuntimeError(f"Failed to load audio: {e.stderr.decode()}") from e
+
+    # copy so the array is writable, as expected by torch.from_numpy
+    return np.frombuffer(out, np.float32).copy()
+
+
+def iter_audio(
+    file_path,
+    block_length=30.0,
+    sample_rate=SAMPLE_RATE,
+    stream_index=None,
+    start=None,
+    duration=None,
+):
+    """
+    Decodes the audio track of a file incrementally using FFmpeg.
+
+    Blocks are read from FFmpeg's stdout as they are decoded, so memory stays
+    constant regardless of the length of the file. FFmpeg is terminated if the
+    generator is closed early.
+
+    Args:
+        file_path (str): The path to the audio or video file.
+        block_length (float): The length of each block in seconds.
+        sample_rate (int): The sample rate to resample the audio to.
+        stream_index (int, optional): The index of the audio stream to decode, see `audio_input`.
+        start (float, optional): The offset in seconds at which to start decoding.
+        duration (float, optional): The maximum number of seconds to decode.
+
+    Yields:
+        np.ndarray: Consecutive blocks of mono float32 audio. The last block may be shorter.
+
+    Raises:
+        RuntimeError: If FFmpeg fails to decode the file.
+    """
+    import numpy as np
+
+    process = (
+        audio_input(file_path, stream_index, start, duration)
+        .output("-", format="f32le", acodec="pcm_f32le", ac=1, ar=sample_rate)
+        .global_args("-nostdin", "-loglevel", "error")
+        .run_async(pipe_stdout=True)
+    )
+    block_bytes = int(block_length * sample_rate) * 4
+    try:
+        while True:
+            data = process.stdout.read(block_bytes)
+            if not data:
+                break
+            yield np.frombuffer(data, np.float32).copy()
+        if process.wait() != 0:
+            raise RuntimeError(
+                f"Failed to load audio: FFmpeg exited with {process.returncode}"
+            )
+    finally:
+        if process.poll() is None:
+            process.kill()
+        process.stdout.close()
+        process.wait()
+
+
+async def aload_audio(
+    file_path, sample_rate=SAMPLE_RATE, stream_index=None, start=None, duration=None
+):
+    """
+    Decodes the audio track of a file into memory in an asyncio subprocess.
+
+    The asynchronous counterpart of `load_audio`. The event loop keeps running while
+    FFmpeg decodes, and FFmpeg is killed if the task is cancelled.
+
+    Args:
+        file_path (str): The path to the audio or video file.
+        sample_rate (int): The sample rate to resample the audio to.
+        stream_index (int, optional): The index of the audio stream to decode, see `audio_input`.
+        start (float, optional): The offset in seconds at which to start decoding.
+        duration (float, optional): The maximum number of seconds to decode.
+
+    Returns:
+        np.ndarray: The mono audio as a float32 array in the range [-1, 1].
+
+    Raises:
+        RuntimeError: If FFmpeg fails to decode the file.
+    """
+    import asyncio
+
+    import numpy as np
+
+    args = (
+        audio_input(file_path, stream_index, start, duration)
+        .output("-", format="f32le", acodec="pcm_f32le", ac=1, ar=sample_rate)
+        .global_args("-nostdin")
+        .compile()
+    )
+    process = await asyncio.create_subprocess_exec(
+        *args, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE
+    )
+    try:
+        out, err = await process.communicate()
+    finally:
+        if process.returncode is None:
+            process.kill()
+            await process.wait()
+    if process.returncode != 0:
+        raise RuntimeError(f"Failed to load audio: {err.decode()}")
+
+    # copy so the array is writable, as expected by torch.from_numpy
+    return np.frombuffer(out, np.float32).copy()
@@ -0,0 +1,130 @@
+import glob
+import os
+from dataclasses import dataclass, field
+
+# File extensions picked up when a directory is searched for media files.
+MEDIA_EXTENSIONS = {
+    ".aac",
+    ".avi",
+    ".flac",
+    ".m4a",
+    ".mkv",
+    ".mov",
+    ".mp3",
+    ".mp4",
+    ".mpeg",
+    ".mpg",
+    ".oga",
+    ".ogg",
+    ".opus",
+    ".wav",
+    ".webm",
+    ".wma",
+    ".wmv",
+}
+
+
+@dataclass
+class BatchResult:
+    """
+    The outcome of transcribing one file of a batch.
+
+    Attributes:
+        path (str): The path to the input file.
+        transcription (dict): The transcription result, or None if the file failed.
+        outputs (list[str]): The paths of the files written for this input.
+        error (Exception): The error raised while processing the file, or None on success.
+        stats (RunStats): The stage timings of the file, or None if decoding failed.
+    """
+
+    path: str
+    transcription: dict = None
+    outputs: list = field(default_factory=list)
+    error: Exception = None
+    stats: object = None
+
+    @property
+    def ok(self):
+        """bool: Whether the file was processed successfully."""
+        return self.error is None
+
+
+def expand_paths(paths_or_glob):
+    """
+    Expands files, directories and glob patterns into a sorted list of files.
+
+    Directories are searched recursively for files with a known media extension,
+    while explicitly listed files and glob matches are taken as they are.
+
+    Args:
+        paths_or_glob (str | Iterable[str]): A path, directory or glob pattern, or a list of them.
+
+    Returns:
+        list[str]: The unique files found, in sorted order.
+    """
+    if isinstance(paths_or_glob, (str, os.PathLike)):
+        paths_or_glob = [paths_or_glob]
+
+    files = set()
+    for entry in map(os.fspath, paths_or_glob):
+        if os.path.isdir(entry):
+            for root, _, names in os.walk(entry):
+                files.update(
+                    os.path.join(root, name)
+                    for name in names
+                    if os.path.splitext(name)[1].lower() in MEDIA_EXTENSIONS
+                )
+        elif os.path.isfile(entry):
+            files.add(entry)
+        else:
+            files.update(
+                path
+                for path in glob.glob(entry, recursive=True)
+                if os.path.isfile(path)
+            )
+    return sorted(files)
+
+
+def missing_paths(paths_or_glob):
+    """
+    Returns the inputs that name no existing file or directory and are no glob pattern.
+
+    `expand_paths` treats such inputs as glob patterns that match nothing, so a mistyped
+    file name would otherwise go unnoticed.
+
+    Args:
+        paths_or_glob (str | Iterable[str]): A path, directory or glob pattern, or a list of them.
+
+    Returns:
+        list[str]: The missing inputs, in the given order.
+    """
+    if isinstance(paths_or_glob, (str, os.PathLike)):
+        paths_or_glob = [paths_or_glob]
+    # patterns may match nothing, only plain paths that do not exist are missing
+    return [
+        entry
+        for entry in map(os.fspath, paths_or_glob)
+        if not os.path.exists(entry) and not any(c in entry for c in "*?[")
+    ]
+
+
+def output_base(file_path, files, output_dir=None):
+    """
+    Returns the output path of a file without extension.
+
+    Within `output_dir` the directory structure of the inputs relative to their
+    common parent is kept, so files with the same name do not overwrite each other.
+
+    Args:
+        file_path (str): The path to the input file.
+        files (list[str]): All input files of the batch.
+        output_dir (str, optional): The output directory. If None, outputs are placed next to the inputs.
+
+    Returns:
+        str: The output path without extension.
+    """
+    base = os.path.splitext(file_path)[0]
+    if output_dir is None:
+        return base
+    root = os.path.commonpath([os.path.dirname(os.path.abspath(f)) for f in files])
+    return os.path.join(output_dir, os.path.relpath(os.path.abspath(base), root))
@@ -0,0 +1,170 @@
+from contextlib import nullcontext
+
+from .audio import SAMPLE_RATE
+from .chunking import shift_segments, split_audio
+
+# The length of the mel window Whisper decodes at a time in seconds.
+WINDOW_LENGTH = 30.0
+
+# The time between two timestamp tokens in seconds.
+TIME_PRECISION = 0.02
+
+
+class BatchedEngine:
+    """
+    Transcribes many 30-second windows at once with batched encoder and decoder passes.
+
+    Whisper's `transcribe` decodes one window at a time. The engine instead computes the
+    log-mel spectrograms of windows from one long recording or from many short clips and
+    runs the encoder and the greedy decoder over `batch_size` windows per pass, which makes
+    much better use of the hardware. Unlike `transcribe`, windows are decoded independently,
+    so the text of the previous window is not used as prompt and there is no temperature fallback.
+
+    Attributes:
+        model (whisper.Whisper): The Whisper model.
+        batch_size (int): The number of windows decoded per pass.
+        language (str): The language of the audio, or None to detect it per window.
+        task (str): 'transcribe' or 'translate'.
+    """
+
+    def __init__(
+        self, model, batch_size=8, language=None, task="transcribe", lock=None
+    ):
+        """
+        Initializes the engine.
+
+        Args:
+            model (whisper.Whisper): The loaded Whisper model.
+            batch_size (int): The number of windows decoded per pass.
+            language (str, optional): The language of the audio. If None, it is detected per window.
+            task (str): 'transcribe' or 'translate'.
+            lock (threading.RLock, optional): A lock held during every pass, e.g. the inference lock
+                                              of a model shared through the registry.
+        """
+        import torch
+        from whisper.tokenizer import get_tokenizer
+
+        assert batch_size >= 1, "batch_size must be at least 1."
+        self.model = model
+        self.batch_size = batch_size
+        self.language = language
+        self.task = task
+        self._lock = lock or nullcontext()
+        self._fp16 = next(model.parameters()).dtype == torch.float16
+        self._tokenizer = get_tokenizer(
+            model.is_multilingual, num_languages=model.num_languages, task=task
+        )
+
+    def _mel(self, window):
+        import whisper
+
+        mel = whisper.log_mel_spectrogram(
+            whisper.pad_or_trim(window),
+            self.model.dims.n_mels,
+            device=self.model.device,
+        )
+        return mel.half() if self._fp16 else mel
+
+    def decode(self, windows):
+        """
+        Decodes windows of up to 30 seconds of audio in batches.
+
+        Args:
+            windows (list[np.ndarray]): The mono audio of each window.
+
+        Returns:
+            list[whisper.DecodingResult]: The decoding result of each window, in order.
+        """
+        import torch
+        import whisper
+
+        options = whisper.DecodingOptions(
+            task=self.task, language=self.language, fp16=self._fp16
+        )
+        results = []
+        for i in range(0, len(windows), self.batch_size):
+            mel = torch.stack([self._mel(w) for w in windows[i : i + self.batch_size]])
+            with self._lock:
+                results.extend(whisper.decode(self.model, mel, options))
+        return results
+
+    def segments(self, result, window_duration):
+        """
+        Splits the tokens of a decoded window into segments at its timestamp tokens.
+
+        Args:
+            result (whisper.DecodingResult): The decoding result of the window.
+            window_duration (float): The duration of the window in seconds, the end of trailing text.
+
+        Returns:
+            list[dict]: The segments with 'start', 'end', 'text' and 'tokens' relative to the window.
+        """
+        timestamp_begin = self._tokenizer.timestamp_begin
+        segments = []
+        start = None
+        tokens = []
+
+        def close(end):
+            segments.append(
+                {
+                    "start": start or 0.0,
+                    "end": end,
+                    "text": self._tokenizer.decode(tokens),
+                    "tokens": list(tokens),
+                    "avg_logprob": result.avg_logprob,
+                    "no_speech_prob": result.no_speech_prob,
+                }
+            )
+
+        for token in result.tokens:
+            if token < timestamp_begin:
+                tokens.append(token)
+                continue
+            time = (token - timestamp_begin) * TIME_PRECISION
+            if tokens:
+                close(time)
+                tokens = []
+            # the end of a segment is the start of the next one, unless another timestamp follows
+            start = time
+        if tokens:
+            close(max(window_duration, start or 0.0))
+        return segments
+
+    def transcribe(self, audios, sample_rate=SAMPLE_RATE):
+        """
+        Transcribes recordings of any length, batching their windows together.
+
+        Every recording is split into windows of up to 30 seconds at silence boundaries,
+        and the windows of all recordings are decoded in batches.
+
+        Args:
+            audios (list[np.ndarray]): The mono audio of each recording.
+            sample_rate (int): The sample rate of the audio.
+
+        Returns:
+            list[dict]: The transcription of each recording with 'text', 'segments' and 'language'.
+        """
+        windows = []
+        for index, audio in enumerate(audios):
+            for start, end in split_audio(audio, WINDOW_LENGTH, sample_rate):
+                windows.append((index, start, audio[start:end]))
+        results = self.decode([window for _, _, window in windows])
+
+        transcriptions = [
+            {"text": "", "segments": [], "language": self.language} for _ in audios
+        ]
+        for (index, start, window), result in zip(windows, results):
+            transcription = transcriptions[index]
+            transcription["language"] = transcription["language"] or result.language
+            # skip silent windows, like Whisper's no_speech_threshold and logprob_threshold
+            if result.no_speech_prob > 0.6 and result.avg_logprob < -1.0:
+                continue
+            segments = self.segments(result, len(window) / sample_rate)
+            for segment in shift_segments(segments, start / sample_rate):
+                segment["id"] = len(transcription["segments"])
+                transcription["segments"].append(segment)
+        for transcription in transcriptions:
+            transcription["text"] = "".join(
+                s["text"] for s in transcription["segments"]
+            )
+        return transcriptions
@@ -0,0 +1,135 @@
+import threading
+
+# Rough real-time factors of the inference of each model on a CPU with Whisper's default
+# decoding, used until the first transcription with the model has been measured.
+PRIOR_RTF = {
+    "tiny": 0.05,
+    "base": 0.1,
+    "small": 0.3,
+    "medium": 0.8,
+    "large": 1.6,
+    "turbo": 0.5,
+}
+
+# The runtime of each preset relative to Whisper's default decoding (None).
+PRESET_COST = {"accurate": 2.0, None: 1.0, "balanced": 0.9, "fastest": 0.6}
+
+# The presets from the most accurate to the fastest.
+PRESET_ORDER = ("accurate", None, "balanced", "fastest")
+
+# The next smaller model of each model, to fall back to when the budget is tight.
+SMALLER_MODEL = {
+    "large": "medium",
+    "turbo": "small",
+    "medium": "small",
+    "small": "base",
+    "base": "tiny",
+}
+
+# The share of the budget a plan may use, leaving room for probing, decoding and model loading.
+BUDGET_SHARE = 0.8
+
+
+class RtfHistory:
+    """
+    The measured real-time factors of the inference per model, device and preset.
+
+    Each transcription updates an exponential moving average, so the estimates follow
+    changes in load. Combinations that have not been measured are estimated from other
+    presets of the same model, or from `PRIOR_RTF`.
+    """
+
+    def __init__(self, smoothing=0.3):
+        """
+        Initializes an empty history.
+
+        Args:
+            smoothing (float): The weight of a new measurement in the moving average.
+        """
+        self.smoothing = smoothing
+        self._rtfs = {}
+        self._lock = threading.Lock()
+
+    def record(self, model, device, preset, rtf):
+        """
+        Adds a measurement.
+
+        Args:
+            model (str): The name of the model.
+            device (str): The torch device the model ran on.
+            preset (str): The decoding preset, or None for Whisper's defaults.
+            rtf (float): The inference time per second of audio.
+        """
+        key = (model, str(device), preset)
+        with self._lock:
+            previous = self._rtfs.get(key)
+            self._rtfs[key] = (
+                rtf
+                if previous is None
+                else previous + self.smoothing * (rtf - previous)
+            )
+
+    def estimate(self, model, device, preset):
+        """
+        Estimates the real-time factor of the inference.
+
+        Args:
+            model (str): The name of the model.
+            device (str): The torch device.
+            preset (str): The decoding preset, or None for Whisper's defaults.
+
+        Returns:
+            float: The expected inference time per second of audio.
+        """
+        with self._lock:
+            rtf = self._rtfs.get((model, str(device), preset))
+            if rtf is not None:
+                return rtf
+            for other in PRESET_ORDER:
+                rtf = self._rtfs.get((model, str(device), other))
+                if rtf is not None:
+                    return rtf / PRESET_COST[other] * PRESET_COST[preset]
+        return PRIOR_RTF[model] * PRESET_COST[preset]
+
+    def clear(self):
+        """
+        Forgets all measurements.
+        """
+        with self._lock:
+            self._rtfs.clear()
+
+
+def plan(duration, budget, model, device=None, preset=None, history=None):
+    """
+    Chooses the most accurate model and preset expected to finish within a time budget.
+
+    The candidates are the given model with its preset and every faster preset, followed
+    by ever smaller models with the 'fastest' preset.
+
+    Args:
+        duration (float): The duration of the audio in seconds.
+        budget (float): The time available in seconds.
+        model (str): The name of the preferred model.
+        device (str, optional): The torch device.
+        preset (str, optional): The preferred decoding preset, or None for Whisper's defaults.
+        history (RtfHistory, optional): The measurements to estimate from. Defaults to `rtf_history`.
+
+    Returns:
+        tuple[str, str, float]: The model, the preset and the estimated real-time factor. If no
+                                candidate fits the budget, the fastest one is returned.
+    """
+    history = history or rtf_history
+    candidates = [(model, p) for p in PRESET_ORDER[PRESET_ORDER.index(preset) :]]
+    while model in SMALLER_MODEL:
+        model = SMALLER_MODEL[model]
+        candidates.append((model, "fastest"))
+
+    for model, preset in candidates:
+        rtf = history.estimate(model, device, preset)
+        if rtf * duration <= budget * BUDGET_SHARE:
+            break
+    return model, preset, rtf
+
+
+# The measurements of all instances in this process.
+rtf_history = RtfHistory()
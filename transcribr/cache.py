@@ -0,0 +1,189 @@
+import hashlib
+import json
+import logging
+import os
+import threading
+
+
+def content_hash(file_path, block_size=1 << 20):
+    """
+    Computes a hash of the bytes of a file.
+
+    Args:
+        file_path (str): The path to the file.
+        block_size (int): The number of bytes read at a time.
+
+    Returns:
+        str: The hexadecimal BLAKE2b digest of the file content.
+    """
+    digest = hashlib.blake2b(digest_size=20)
+    with open(file_path, "rb") as file:
+        while block := file.read(block_size):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class TranscriptionCache:
+    """
+    An on-disk cache of transcriptions, addressed by the content of the transcribed media.
+
+    Entries are stored as JSON files keyed by the content hash of the media together with
+    the model and the options used. Every hit refreshes the modification time of the entry,
+    and the least recently used entries are evicted once the cache exceeds its size limit.
+
+    Attributes:
+        directory (str): The directory the entries are stored in.
+        max_bytes (int): The maximum total size of all entries in bytes, or None for no limit.
+    """
+
+    def __init__(self, directory, max_bytes=None):
+        """
+        Initializes the cache and creates its directory.
+
+        Args:
+            directory (str): The directory the entries are stored in.
+            max_bytes (int, optional): The maximum total size of all entries in bytes.
+        """
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+    @staticmethod
+    def key(content_hash, model, options=None):
+        """
+        Builds the cache key of a transcription.
+
+        Args:
+            content_hash (str): The content hash of the media, see `content_hash`.
+            model (str): The name of the model used.
+            options (dict, optional): All options that influence the transcription.
+
+        Returns:
+            str: The cache key.
+        """
+        payload = json.dumps([content_hash, model, options or {}], sort_keys=True)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key):
+        """
+        Looks up a transcription.
+
+        Args:
+            key (str): The cache key.
+
+        Returns:
+            dict: The cached transcription, or None on a miss.
+        """
+        path = self._path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as file:
+                transcription = json.load(file)
+            os.utime(path)
+        except (OSError, ValueError):
+            return None
+        return transcription
+
+    def put(self, key, transcription):
+        """
+        Stores a transcription and evicts old entries if the cache is too large.
+
+        Args:
+            key (str): The cache key.
+            transcription (dict): The transcription result.
+        """
+        path = self._path(key)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as file:
+            json.dump(transcription, file, default=float)
+        os.replace(tmp_path, path)
+        self._evict()
+
+    def _path(self, key):
+        return os.path.join(self.directory, f"{key}.json")
+
+    def _evict(self):
+        if self.max_bytes is None:
+            return
+        with self._lock:
+            entries = []
+            for entry in os.scandir(self.directory):
+                if entry.name.endswith(".json"):
+                    try:
+                        stat = entry.stat()
+                    except OSError:
+                        continue
+                    entries.append((stat.st_mtime, stat.st_size, entry.path))
+
+            total = sum(size for _, size, _ in entries)
+            for _, size, path in sorted(entries):
+                if total <= self.max_bytes:
+                    break
+                try:
+                    os.remove(path)
+                    logging.info(f"Evicted cached transcription '{path}'")
+                except OSError:
+                    pass
+                total -= size
+
+
+class LanguageCache:
+    """
+    The languages detected per source, e.g. per podcast feed or channel.
+
+    Files from a source whose language is known skip language detection. The languages
+    are kept in memory and, if a path is given, persisted to a JSON file.
+
+    Attributes:
+        path (str): The path to the JSON file, or None.
+    """
+
+    def __init__(self, path=None):
+        """
+        Initializes the cache, loading the languages stored at path.
+
+        Args:
+            path (str, optional): The path to the JSON file the languages are persisted to.
+        """
+        self.path = path
+        self._languages = {}
+        self._lock = threading.Lock()
+        if path is not None:
+            try:
+                with open(path, "r", encoding="utf-8") as file:
+                    self._languages = json.load(file)
+            except FileNotFoundError:
+                pass
+            except (OSError, ValueError) as e:
+                logging.warning(f"Ignoring invalid language cache '{path}': {e}")
+
+    def get(self, source):
+        """
+        Looks up the language of a source.
+
+        Args:
+            source (str): The source, e.g. the URL of a feed.
+
+        Returns:
+            str: The language code, or None if unknown.
+        """
+        with self._lock:
+            return self._languages.get(source)
+
+    def set(self, source, language):
+        """
+        Stores the language of a source.
+
+        Args:
+            source (str): The source, e.g. the URL of a feed.
+            language (str): The language code.
+        """
+        with self._lock:
+            if self._languages.get(source) == language:
+                return
+            self._languages[source] = language
+            if self.path is not None:
+                tmp_path = f"{self.path}.{os.getpid()}.{threading.get_ident()}.tmp"
+                with open(tmp_path, "w", encoding="utf-8") as file:
+                    json.dump(self._languages, file)
+                os.replace(tmp_path, self.path)
@@ -0,0 +1,143 @@
+import hashlib
+import json
+import logging
+import os
+
+
+class Checkpoint:
+    """
+    A sidecar file recording the progress of a chunked transcription.
+
+    The file is a JSON lines log: a header with the key of the transcription, followed by
+    one record per finished chunk with its segments, the number of samples transcribed so far,
+    the detected language and the prompt for the next chunk. Records are appended and synced
+    to disk, so a crash loses at most the chunk in progress, and a partially written last
+    record is discarded on load.
+
+    Attributes:
+        path (str): The path to the checkpoint file.
+        key (str): The key of the transcription, see `key`.
+        segments (list[dict]): The segments of all finished chunks.
+        samples (int): The number of samples transcribed so far.
+        language (str): The detected language, or None.
+        prompt (str): The prompt for the next chunk, or None.
+    """
+
+    def __init__(self, path, key):
+        """
+        Opens the checkpoint, restoring its progress if it belongs to the same transcription.
+
+        Args:
+            path (str): The path to the checkpoint file.
+            key (str): The key of the transcription. A checkpoint with a different key is discarded.
+        """
+        self.path = path
+        self.key = key
+        self.segments = []
+        self.samples = 0
+        self.language = None
+        self.prompt = None
+        self._file = None
+
+        size = self._load() if os.path.exists(path) else 0
+        if size:
+            self._file = open(path, "r+b")
+            # cut off a partially written record before appending
+            self._file.truncate(size)
+            self._file.seek(size)
+            if self.samples:
+                logging.info(
+                    f"Resuming from checkpoint '{path}' after {len(self.segments)} segments."
+                )
+        else:
+            self._file = open(path, "wb")
+            self._append({"key": key})
+
+    @staticmethod
+    def key(file_path, model, options=None):
+        """
+        Builds the key of a transcription from the identity of the file and all options.
+
+        Args:
+            file_path (str): The path to the transcribed file.
+            model (str): The name of the model used.
+            options (dict, optional): All options that influence the transcription.
+
+        Returns:
+            str: The hexadecimal SHA-256 digest of the key.
+        """
+        stat = os.stat(file_path)
+        data = {
+            "path": os.path.abspath(file_path),
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+            "model": model,
+            "options": options or {},
+        }
+        return hashlib.sha256(json.dumps(data, sort_keys=True).encode()).hexdigest()
+
+    def _load(self):
+        # restores all complete records and returns the size of the valid part of the file
+        size = 0
+        with open(self.path, "rb") as file:
+            for i, line in enumerate(file):
+                try:
+                    record = json.loads(line) if line.endswith(b"\n") else None
+                except ValueError:
+                    record = None
+                if record is None:
+                    break
+                if i == 0:
+                    if record.get("key") != self.key:
+                        logging.info(f"Discarding outdated checkpoint '{self.path}'.")
+                        return 0
+                else:
+                    self.segments.extend(record["segments"])
+                    self.samples = record["samples"]
+                    self.language = record["language"]
+                    self.prompt = record["prompt"]
+                size += len(line)
+        return size
+
+    def _append(self, record):
+        self._file.write(json.dumps(record).encode() + b"\n")
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def record(self, segments, samples, language, prompt):
+        """
+        Persists a finished chunk.
+
+        Args:
+            segments (list[dict]): The segments of the chunk.
+            samples (int): The number of samples transcribed including the chunk.
+            language (str): The detected language.
+            prompt (str): The prompt for the next chunk.
+        """
+        self._append(
+            {
+                "segments": segments,
+                "samples": samples,
+                "language": language,
+                "prompt": prompt,
+            }
+        )
+        self.segments.extend(segments)
+        self.samples = samples
+        self.language = language
+        self.prompt = prompt
+
+    def close(self):
+        """
+        Closes the checkpoint file, keeping it for a later resume.
+        """
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def remove(self):
+        """
+        Closes and deletes the checkpoint file once the transcription is complete.
+        """
+        self.close()
+        os.remove(self.path)
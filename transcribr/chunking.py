@@ -0,0 +1,254 @@
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+from .audio import SAMPLE_RATE
+from .runtime import (
+    available_cpus,
+    configure,
+    next_worker_index,
+    resolve_device,
+    worker_cpus,
+)
+
+# The model held by each worker process of the chunk pool.
+_worker_model = None
+
+
+def frame_energy(audio, frame_length):
+    """
+    Computes the mean energy of consecutive, non-overlapping frames.
+
+    Args:
+        audio (np.ndarray): The mono audio signal.
+        frame_length (int): The number of samples per frame.
+
+    Returns:
+        np.ndarray: The energy of each complete frame.
+    """
+    n_frames = len(audio) // frame_length
+    frames = audio[: n_frames * frame_length].reshape(n_frames, frame_length)
+    return (frames.astype("float64") ** 2).mean(axis=1)
+
+
+def find_split_points(
+    audio, chunk_length, sample_rate=SAMPLE_RATE, search_window=5.0, frame_length=0.02
+):
+    """
+    Finds positions to split the audio into chunks at silence boundaries.
+
+    Each split is placed at the quietest frame within `search_window` seconds before
+    the position where the chunk would reach its maximum length, so no chunk is longer
+    than `chunk_length` seconds.
+
+    Args:
+        audio (np.ndarray): The mono audio signal.
+        chunk_length (float): The maximum length of a chunk in seconds.
+        sample_rate (int): The sample rate of the audio.
+        search_window (float): The length of the window searched for silence in seconds.
+        frame_length (float): The length of the frames the energy is computed on in seconds.
+
+    Returns:
+        list[int]: The sample indices at which the audio is split.
+    """
+    frame = max(1, int(frame_length * sample_rate))
+    energy = frame_energy(audio, frame)
+    chunk = int(chunk_length * sample_rate)
+    window = min(int(search_window * sample_rate), chunk // 2)
+
+    splits = []
+    position = 0
+    while len(audio) - position > chunk:
+        first = (position + chunk - window) // frame
+        last = (position + chunk) // frame
+        if last > first:
+            quietest = first + int(energy[first:last].argmin())
+            split = quietest * frame + frame // 2
+        else:
+            split = position + chunk
+        splits.append(split)
+        position = split
+    return splits
+
+
+def split_audio(audio, chunk_length, sample_rate=SAMPLE_RATE, **kwargs):
+    """
+    Splits the audio into chunks at silence boundaries.
+
+    Args:
+        audio (np.ndarray): The mono audio signal.
+        chunk_length (float): The maximum length of a chunk in seconds.
+        sample_rate (int): The sample rate of the audio.
+        **kwargs: Further arguments passed to `find_split_points`.
+
+    Returns:
+        list[tuple[int, int]]: The start and end sample of each chunk.
+    """
+    bounds = [0] + find_split_points(audio, chunk_length, sample_rate, **kwargs)
+    bounds.append(len(audio))
+    return list(zip(bounds[:-1], bounds[1:]))
+
+
+def iter_chunks(blocks, chunk_length, sample_rate=SAMPLE_RATE, **kwargs):
+    """
+    Regroups a stream of audio blocks into chunks split at silence boundaries.
+
+    Args:
+        blocks (Iterable[np.ndarray]): Consecutive blocks of mono audio, e.g. from `iter_audio`.
+        chunk_length (float): The maximum length of a chunk in seconds.
+        sample_rate (int): The sample rate of the audio.
+        **kwargs: Further arguments passed to `find_split_points`.
+
+    Yields:
+        tuple[int, np.ndarray]: The start sample and the audio of each chunk.
+    """
+    import numpy as np
+
+    chunk = int(chunk_length * sample_rate)
+    buffer = np.zeros(0, np.float32)
+    position = 0
+    for block in blocks:
+        buffer = np.concatenate([buffer, block])
+        while len(buffer) > chunk:
+            split = find_split_points(buffer, chunk_length, sample_rate, **kwargs)[0]
+            yield position, buffer[:split]
+            buffer = buffer[split:]
+            position += split
+    if len(buffer):
+        yield position, buffer
+
+
+def shift_segments(segments, offset):
+    """
+    Moves the timestamps of segments (and their words) by a constant offset.
+
+    Args:
+        segments (list[dict]): The segments returned by Whisper.
+        offset (float): The offset in seconds.
+
+    Returns:
+        list[dict]: The shifted segments.
+    """
+    shifted = []
+    for segment in segments:
+        segment = dict(segment, start=segment["start"] + offset)
+        segment["end"] += offset
+        if "words" in segment:
+            segment["words"] = [
+                dict(w, start=w["start"] + offset, end=w["end"] + offset)
+                for w in segment["words"]
+            ]
+        shifted.append(segment)
+    return shifted
+
+
+def merge_transcriptions(results, chunks, overlap=0.0, sample_rate=SAMPLE_RATE):
+    """
+    Stitches the transcriptions of consecutive chunks into one transcription.
+
+    Segment timestamps are shifted to the global timeline. Chunks are transcribed with
+    `overlap` seconds of additional context on each side; a segment is only kept by the
+    chunk that owns its midpoint, so text in the overlap is not duplicated.
+
+    Args:
+        results (list[dict]): The transcription of each chunk.
+        chunks (list[tuple[int, int]]): The start and end sample of each chunk.
+        overlap (float): The context added on each side of a chunk in seconds.
+        sample_rate (int): The sample rate of the audio.
+
+    Returns:
+        dict: The merged transcription with 'text', 'segments' and 'language'.
+    """
+    segments = []
+    for i, (result, (start, end)) in enumerate(zip(results, chunks)):
+        own_start, own_end = start / sample_rate, end / sample_rate
+        if i == len(chunks) - 1:
+            own_end = float("inf")
+        offset = max(0.0, own_start - overlap)
+        for segment in shift_segments(result["segments"], offset):
+            midpoint = (segment["start"] + segment["end"]) / 2
+            if own_start <= midpoint < own_end:
+                segments.append(segment)
+
+    for i, segment in enumerate(segments):
+        segment["id"] = i
+    return {
+        "text": "".join(segment["text"] for segment in segments),
+        "segments": segments,
+        "language": results[0].get("language") if results else None,
+    }
+
+
+def _init_worker(model, device, dtype, workers, cpus, counter):
+    global _worker_model
+    from .registry import registry
+
+    index = next_worker_index(counter)
+    affinity = worker_cpus(index, workers, cpus) if cpus is not None else None
+    configure(threads="auto", affinity=affinity, workers=workers, index=index)
+    device = resolve_device(device, index)
+    _worker_model = registry.acquire(model, device=device, dtype=dtype)
+
+
+def _transcribe_chunk(audio, options):
+    return _worker_model.transcribe(audio, **options)
+
+
+def transcribe_parallel(
+    audio,
+    model,
+    device=None,
+    dtype=None,
+    workers=None,
+    chunk_length=120.0,
+    overlap=1.0,
+    sample_rate=SAMPLE_RATE,
+    cpu_affinity=None,
+    **options,
+):
+    """
+    Transcribes audio in chunks split at silence, concurrently in a process pool.
+
+    Every worker process loads its own copy of the model and uses an equal share of the
+    CPU cores.
+
+    Args:
+        audio (np.ndarray): The mono audio signal.
+        model (str): The size of the Whisper model to use.
+        device (str, optional): The torch device of the workers, or 'auto' to spread them over the GPUs.
+        dtype (str, optional): The name of the torch dtype of the model weights.
+        workers (int, optional): The number of worker processes. Defaults to the number of CPUs.
+        chunk_length (float): The maximum length of a chunk in seconds.
+        overlap (float): The context added on each side of a chunk in seconds.
+        sample_rate (int): The sample rate of the audio.
+        cpu_affinity (Iterable[int] | str, optional): If given, every worker is pinned to its own share
+                                                      of these CPUs, or of all available CPUs if 'auto'.
+        **options: Further options passed to `model.transcribe`.
+
+    Returns:
+        dict: The merged transcription with 'text', 'segments' and 'language'.
+    """
+    workers = workers or len(available_cpus())
+    chunks = split_audio(audio, chunk_length, sample_rate)
+    workers = min(workers, len(chunks))
+    cpus = available_cpus() if cpu_affinity == "auto" else cpu_affinity
+    pad = int(overlap * sample_rate)
+
+    logging.info(f"Transcribing {len(chunks)} chunks on {workers} workers...")
+    # spawn instead of fork, since torch is not fork-safe once initialized
+    context = multiprocessing.get_context("spawn")
+    counter = context.Value("i", 0)
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=context,
+        initializer=_init_worker,
+        initargs=(model, device, dtype, workers, cpus, counter),
+    ) as pool:
+        futures = [
+            pool.submit(
+                _transcribe_chunk, audio[max(0, start - pad) : end + pad], options
+            )
+            for start, end in chunks
+        ]
+        results = [future.result() for future in futures]
+    return merge_transcriptions(results, chunks, overlap, sample_rate)
@@ -0,0 +1,250 @@
+import argparse
+import logging
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from .batch import expand_paths, missing_paths, output_base
+from .presets import PRESETS
+from .runtime import next_worker_index
+from .transcribr import MODELS
+
+# Output formats supported on the command line by file extension.
+FORMATS = ("txt", "srt")
+
+# The Transcribr instance of each worker process.
+_worker = None
+
+
+def _init_worker(options, log_level, counter):
+    global _worker
+    from .transcribr import Transcribr
+
+    logging.getLogger().setLevel(log_level)
+    _worker = Transcribr(**options, worker_index=next_worker_index(counter))
+    # also applies the thread and affinity settings of the worker
+    _worker.warmup()
+
+
+def _process(file_path, base, formats, transcribe_options):
+    """
+    Transcribes one file with the worker's Transcribr and writes the requested formats.
+
+    Returns:
+        dict: The path, written outputs, audio duration and error message of the file.
+    """
+    result = {"path": file_path, "outputs": [], "audio_duration": 0.0, "error": None}
+    try:
+        _worker.transcribe(file_path, **transcribe_options)
+        for fmt in formats:
+            output_file = f"{base}.{fmt}"
+            if fmt == "txt":
+                _worker.save_transcription(output_file)
+            else:
+                _worker.save_subtitles(output_file)
+            result["outputs"].append(output_file)
+        result["audio_duration"] = _worker.last_run_stats.audio_duration or 0.0
+    except Exception as e:
+        logging.error(f"Failed to transcribe '{file_path}': {e}")
+        result["error"] = str(e)
+    return result
+
+
+def is_up_to_date(file_path, outputs):
+    """
+    Checks whether all outputs exist and are newer than the input file.
+
+    Args:
+        file_path (str): The path to the input file.
+        outputs (list[str]): The paths of the output files.
+
+    Returns:
+        bool: True if no output needs to be regenerated.
+    """
+    mtime = os.path.getmtime(file_path)
+    return all(os.path.exists(o) and os.path.getmtime(o) >= mtime for o in outputs)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="transcribr",
+        description="Transcribe audio and video files and generate subtitles.",
+    )
+    parser.add_argument(
+        "inputs",
+        nargs="+",
+        help="Files, directories (searched recursively) or glob patterns.",
+    )
+    parser.add_argument(
+        "-m",
+        "--model",
+        default="base",
+        choices=MODELS,
+        help="The Whisper model to use (default: base).",
+    )
+    parser.add_argument(
+        "-f",
+        "--formats",
+        default="txt,srt",
+        help=f"Comma-separated output formats out of {', '.join(FORMATS)} (default: txt,srt).",
+    )
+    parser.add_argument(
+        "-o",
+        "--output-dir",
+        help="Directory for the outputs. By default they are written next to the inputs.",
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=1,
+        help="Number of worker processes, each with its own model (default: 1).",
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Transcribe files even if their outputs are up to date.",
+    )
+    parser.add_argument(
+        "--device",
+        help="The torch device, e.g. 'cpu' or 'cuda', or 'auto' to spread jobs over the GPUs.",
+    )
+    parser.add_argument(
+        "--threads",
+        default="auto",
+        help="Torch threads per job, or 'auto' to divide the CPUs among the jobs (default: auto).",
+    )
+    parser.add_argument(
+        "--interop-threads", type=int, help="Torch inter-op threads per job."
+    )
+    parser.add_argument(
+        "--pin-cpus",
+        action="store_true",
+        help="Pin every job to its own share of the CPUs.",
+    )
+    parser.add_argument(
+        "--vad", action="store_true", help="Skip silence before transcribing."
+    )
+    parser.add_argument(
+        "--preset",
+        choices=list(PRESETS),
+        help="The decoding preset trading speed for accuracy (default: Whisper's defaults).",
+    )
+    parser.add_argument(
+        "-l",
+        "--language",
+        help="The language of the inputs, e.g. 'en'. By default it is detected per file.",
+    )
+    parser.add_argument(
+        "-q", "--quiet", action="store_true", help="Only log warnings and errors."
+    )
+    args = parser.parse_args(argv)
+
+    args.formats = [f.strip() for f in args.formats.split(",") if f.strip()]
+    invalid = set(args.formats) - set(FORMATS)
+    if invalid or not args.formats:
+        parser.error(f"Invalid format. Choose from {', '.join(FORMATS)}.")
+    if args.jobs < 1:
+        parser.error("--jobs must be at least 1.")
+    if args.threads != "auto":
+        try:
+            args.threads = int(args.threads)
+        except ValueError:
+            parser.error("--threads must be a number or 'auto'.")
+    return args
+
+
+def main(argv=None):
+    """
+    Runs the transcribr command line interface.
+
+    Args:
+        argv (list[str], optional): The command line arguments. Defaults to sys.argv.
+
+    Returns:
+        int: The exit code, 1 if any file failed or an input was not found and 0 otherwise.
+    """
+    args = parse_args(argv)
+    logging.getLogger().setLevel(logging.WARNING if args.quiet else logging.INFO)
+
+    missing = missing_paths(args.inputs)
+    for path in missing:
+        print(f"Not found: {path}", file=sys.stderr)
+    files = expand_paths(args.inputs)
+    tasks = []
+    skipped = 0
+    for file_path in files:
+        base = output_base(file_path, files, args.output_dir)
+        outputs = [f"{base}.{fmt}" for fmt in args.formats]
+        if not args.force and is_up_to_date(file_path, outputs):
+            skipped += 1
+            continue
+        tasks.append((file_path, base))
+
+    print(
+        f"Transcribing {len(tasks)} files ({skipped} up to date) with {args.jobs} jobs...",
+        file=sys.stderr,
+    )
+    start = time.perf_counter()
+    log_level = logging.getLogger().level
+    transcribe_options = {"vad": args.vad, "language": args.language}
+    results = []
+    if tasks:
+        jobs = min(args.jobs, len(tasks))
+        options = {
+            "model": args.model,
+            "device": args.device,
+            "in_memory": True,
+            "threads": args.threads,
+            "interop_threads": args.interop_threads,
+            "cpu_affinity": "auto" if args.pin_cpus else None,
+            "node_workers": jobs,
+            "preset": args.preset,
+        }
+        # spawn instead of fork, since torch is not fork-safe once initialized
+        context = multiprocessing.get_context("spawn")
+        # hands out the worker indices for the 'auto' device and affinity settings
+        counter = context.Value("i", 0)
+        if jobs == 1:
+            _init_worker(options, log_level, counter)
+            for file_path, base in tasks:
+                results.append(
+                    _process(file_path, base, args.formats, transcribe_options)
+                )
+        else:
+            with ProcessPoolExecutor(
+                max_workers=jobs,
+                mp_context=context,
+                initializer=_init_worker,
+                initargs=(options, log_level, counter),
+            ) as pool:
+                futures = [
+                    pool.submit(_process, f, base, args.formats, transcribe_options)
+                    for f, base in tasks
+                ]
+                results = [future.result() for future in futures]
+    elapsed = time.perf_counter() - start
+
+    failed = [r for r in results if r["error"] is not None]
+    audio = sum(r["audio_duration"] for r in results)
+    done = len(results) - len(failed)
+    print(
+        f"Done: {done} transcribed, {skipped} up to date, {len(failed)} failed "
+        f"in {elapsed:.1f}s.",
+        file=sys.stderr,
+    )
+    if elapsed > 0 and results:
+        print(
+            f"Throughput: {audio / elapsed:.2f}s of audio per second, "
+            f"{done / elapsed * 60:.1f} files per minute.",
+            file=sys.stderr,
+        )
+    for r in failed:
+        print(f"Failed: {r['path']}: {r['error']}", file=sys.stderr)
+    return 1 if failed or missing else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
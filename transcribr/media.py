@@ -0,0 +1,226 @@
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+
+import ffmpeg
+
+# Maximum number of probe results kept in the in-process cache.
+PROBE_CACHE_SIZE = 4096
+
+_probe_cache = OrderedDict()
+_probe_cache_lock = threading.Lock()
+
+
+@dataclass(frozen=True)
+class StreamInfo:
+    """
+    Metadata of a single stream within a media file.
+
+    Attributes:
+        index (int): The index of the stream within the file.
+        codec_type (str): The stream type, e.g. 'audio' or 'video'.
+        codec_name (str): The name of the codec, e.g. 'aac' or 'h264'.
+        sample_rate (int): The sample rate of an audio stream, None otherwise.
+        channels (int): The number of channels of an audio stream, None otherwise.
+        attached_pic (bool): Whether a video stream is only embedded cover art.
+    """
+
+    index: int
+    codec_type: str
+    codec_name: str = None
+    sample_rate: int = None
+    channels: int = None
+    attached_pic: bool = False
+
+
+@dataclass(frozen=True)
+class MediaInfo:
+    """
+    The result of probing a media file with FFprobe.
+
+    Attributes:
+        path (str): The path to the media file.
+        streams (tuple[StreamInfo]): The streams contained in the file.
+        duration (float): The duration of the file in seconds, if known.
+        format_name (str): The container format reported by FFprobe.
+    """
+
+    path: str
+    streams: tuple
+    duration: float = None
+    format_name: str = None
+
+    @property
+    def audio_streams(self):
+        """list[StreamInfo]: The audio streams of the file."""
+        return [s for s in self.streams if s.codec_type == "audio"]
+
+    @property
+    def video_streams(self):
+        """list[StreamInfo]: The video streams of the file, excluding embedded cover art."""
+        return [
+            s for s in self.streams if s.codec_type == "video" and not s.attached_pic
+        ]
+
+    @property
+    def has_audio(self):
+        """bool: Whether the file contains an audio stream."""
+        return bool(self.audio_streams)
+
+    @property
+    def has_video(self):
+        """bool: Whether the file contains a video stream."""
+        return bool(self.video_streams)
+
+    @property
+    def sample_rate(self):
+        """int: The sample rate of the first audio stream, if any."""
+        audio = self.audio_streams
+        return audio[0].sample_rate if audio else None
+
+    @property
+    def channels(self):
+        """int: The number of channels of the first audio stream, if any."""
+        audio = self.audio_streams
+        return audio[0].channels if audio else None
+
+    @property
+    def codec(self):
+        """str: The codec of the first audio stream, if any."""
+        audio = self.audio_streams
+        return audio[0].codec_name if audio else None
+
+    def to_dict(self):
+        """
+        Converts the media info into a JSON serializable dictionary.
+
+        Returns:
+            dict: The media info as a dictionary.
+        """
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data):
+        """
+        Creates a MediaInfo from a dictionary created by `to_dict`.
+
+        Args:
+            data (dict): The media info as a dictionary.
+
+        Returns:
+            MediaInfo: The restored media info.
+        """
+        data = dict(data)
+        data["streams"] = tuple(StreamInfo(**s) for s in data["streams"])
+        return cls(**data)
+
+    @classmethod
+    def from_probe(cls, path, metadata):
+        """
+        Creates a MediaInfo from the output of `ffmpeg.probe`.
+
+        Args:
+            path (str): The path to the probed file.
+            metadata (dict): The metadata returned by `ffmpeg.probe`.
+
+        Returns:
+            MediaInfo: The parsed media info.
+        """
+        streams = tuple(
+            StreamInfo(
+                index=s.get("index", i),
+                codec_type=s.get("codec_type"),
+                codec_name=s.get("codec_name"),
+                sample_rate=_to_number(s.get("sample_rate"), int),
+                channels=s.get("channels"),
+                attached_pic=bool(s.get("disposition", {}).get("attached_pic")),
+            )
+            for i, s in enumerate(metadata.get("streams", []))
+        )
+        fmt = metadata.get("format", {})
+        return cls(
+            path=path,
+            streams=streams,
+            duration=_to_number(fmt.get("duration"), float),
+            format_name=fmt.get("format_name"),
+        )
+
+
+def _to_number(value, type_):
+    try:
+        return type_(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def probe(file_path, cache_dir=None):
+    """
+    Probes a media file with a single FFprobe call.
+
+    Results are cached in-process and, if a cache directory is given, on disk.
+    Cache entries are keyed by the file's absolute path, modification time and
+    size, so a modified file is probed again.
+
+    Args:
+        file_path (str): The path to the media file.
+        cache_dir (str, optional): A directory to persist probe results in.
+
+    Returns:
+        MediaInfo: The streams, duration and format of the file.
+
+    Raises:
+        ffmpeg.Error: If FFprobe fails to read the file.
+    """
+    path = os.path.abspath(file_path)
+    stat = os.stat(path)
+    key = (path, stat.st_mtime_ns, stat.st_size)
+
+    with _probe_cache_lock:
+        info = _probe_cache.get(key)
+        if info is not None:
+            _probe_cache.move_to_end(key)
+            return info
+
+    cache_file = None
+    if cache_dir is not None:
+        digest = hashlib.sha1(repr(key).encode("utf-8")).hexdigest()
+        cache_file = os.path.join(cache_dir, f"{digest}.json")
+        info = _read_cache_file(cache_file)
+
+    if info is None:
+        info = MediaInfo.from_probe(file_path, ffmpeg.probe(file_path))
+        if cache_file is not None:
+            _write_cache_file(cache_file, info)
+
+    with _probe_cache_lock:
+        _probe_cache[key] = info
+        if len(_probe_cache) > PROBE_CACHE_SIZE:
+            _probe_cache.popitem(last=False)
+    return info
+
+
+def clear_probe_cache():
+    """
+    Clears the in-process probe cache.
+    """
+    with _probe_cache_lock:
+        _probe_cache.clear()
+
+
+def _read_cache_file(cache_file):
+    try:
+        with open(cache_file, "r", encoding="utf-8") as file:
+            return MediaInfo.from_dict(json.load(file))
+    except (OSError, ValueError, TypeError, KeyError):
+        return None
+
+
+def _write_cache_file(cache_file, info):
+    os.makedirs(os.path.dirname(cache_file), exist_ok=True)
+    tmp_file = f"{cache_file}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp_file, "w", encoding="utf-8") as file:
+        json.dump(info.to_dict(), file)
+    os.replace(tmp_file, cache_file)
@@ -0,0 +1,47 @@
+# Named trade-offs between speed and accuracy, passed to Whisper's `transcribe`.
+# Every preset sets the same options, so a preset passed to a single call fully
+# overrides the preset of the instance.
+PRESETS = {
+    # greedy decoding of every window exactly once: no temperature fallback and no
+    # conditioning on the previous text, which also avoids repetition loops
+    "fastest": {
+        "beam_size": None,
+        "best_of": None,
+        "temperature": 0.0,
+        "condition_on_previous_text": False,
+    },
+    # greedy decoding with a short fallback ladder for windows that fail the
+    # compression ratio or log probability thresholds
+    "balanced": {
+        "beam_size": None,
+        "best_of": None,
+        "temperature": (0.0, 0.4, 0.8),
+        "condition_on_previous_text": True,
+    },
+    # beam search with the full fallback ladder, like Whisper's command line
+    "accurate": {
+        "beam_size": 5,
+        "best_of": 5,
+        "temperature": (0.0, 0.2, 0.4, 0.6, 0.8, 1.0),
+        "condition_on_previous_text": True,
+    },
+}
+
+
+def resolve_preset(preset=None, options=None):
+    """
+    Resolves a preset and raw options into the options passed to Whisper's `transcribe`.
+
+    Args:
+        preset (str, optional): The name of a preset in `PRESETS`. If None, Whisper's defaults are used.
+        options (dict, optional): Raw options of `transcribe`, e.g. 'beam_size', 'temperature',
+                                  'condition_on_previous_text' or 'compression_ratio_threshold'.
+                                  They take precedence over the preset.
+
+    Returns:
+        dict: The decoding options.
+    """
+    assert (
+        preset is None or preset in PRESETS
+    ), f"Invalid preset. Choose from {', '.join(PRESETS)}."
+    return {**(PRESETS[preset] if preset else {}), **(options or {})}
@@ -0,0 +1,95 @@
+import logging
+import os
+
+# The quantization schemes supported by `Transcribr(quantize=...)`.
+QUANTIZATIONS = ("int8",)
+
+
+def default_cache_dir():
+    """
+    Returns the directory in which quantized models are cached.
+
+    Returns:
+        str: $TRANSCRIBR_CACHE_DIR, or 'transcribr' in $XDG_CACHE_HOME or ~/.cache.
+    """
+    default = os.path.join(
+        os.getenv("XDG_CACHE_HOME", os.path.expanduser("~/.cache")), "transcribr"
+    )
+    return os.getenv("TRANSCRIBR_CACHE_DIR", default)
+
+
+def _quantize_linear_layers(model):
+    import torch
+    from torch import nn
+
+    # whisper's Linear only casts the weights to the input dtype, and quantize_dynamic
+    # matches module types exactly, so the layers are turned into plain nn.Linear first
+    for module in model.modules():
+        if isinstance(module, nn.Linear):
+            module.__class__ = nn.Linear
+    return torch.ao.quantization.quantize_dynamic(model, {nn.Linear}, dtype=torch.qint8)
+
+
+def quantize_model(model):
+    """
+    Applies dynamic int8 quantization to the linear layers of a Whisper model.
+
+    The weights of the attention and MLP layers are stored as int8 and activations are
+    quantized on the fly, which reduces their memory by 4x and speeds up inference on CPUs.
+    The embeddings, convolutions and layer norms stay in float32.
+
+    Args:
+        model (whisper.Whisper): The float32 model on the CPU. It is modified in place.
+
+    Returns:
+        whisper.Whisper: The quantized model.
+    """
+    return _quantize_linear_layers(model.eval())
+
+
+def load_quantized(name, cache_dir=None):
+    """
+    Loads an int8 quantized Whisper model, quantizing and caching it on first use.
+
+    The quantized state dict is cached on disk together with the model dimensions, so later
+    loads skip loading the float32 checkpoint and quantizing it.
+
+    Args:
+        name (str): The name of the Whisper model.
+        cache_dir (str, optional): The directory of the cached models. Defaults to `default_cache_dir()`.
+
+    Returns:
+        whisper.Whisper: The quantized model on the CPU.
+    """
+    import torch
+    import whisper
+    from whisper.model import ModelDimensions, Whisper
+
+    cache_dir = cache_dir or default_cache_dir()
+    path = os.path.join(cache_dir, f"{name}-int8.pt")
+    if os.path.exists(path):
+        try:
+            checkpoint = torch.load(path, map_location="cpu", weights_only=True)
+            model = quantize_model(Whisper(ModelDimensions(**checkpoint["dims"])))
+            model.load_state_dict(checkpoint["state_dict"])
+            model.register_buffer(
+                "alignment_heads",
+                checkpoint["alignment_heads"].to_sparse(),
+                persistent=False,
+            )
+            return model
+        except Exception as e:
+            logging.warning(f"Ignoring invalid quantized model '{path}': {e}")
+
+    model = quantize_model(whisper.load_model(name, device="cpu"))
+    os.makedirs(cache_dir, exist_ok=True)
+    checkpoint = {
+        "dims": vars(model.dims),
+        "state_dict": model.state_dict(),
+        "alignment_heads": model.alignment_heads.to_dense(),
+    }
+    # write to a temporary file first, so concurrent loads never read a partial file
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    torch.save(checkpoint, tmp_path)
+    os.replace(tmp_path, path)
+    return model
@@ -0,0 +1,213 @@
+import logging
+import threading
+from collections import OrderedDict
+
+
+class _Entry:
+    """
+    A loaded model together with its bookkeeping data.
+    """
+
+    def __init__(self, model, nbytes):
+        self.model = model
+        self.nbytes = nbytes
+        self.refcount = 0
+        # whisper installs its kv-cache hooks on the shared modules during decoding,
+        # so concurrent inference on the same model has to be serialized
+        self.lock = threading.RLock()
+
+
+class ModelRegistry:
+    """
+    A process-wide registry that shares loaded Whisper models between Transcribr instances.
+
+    Models are keyed by (model name, device, dtype) and reference counted. Models that are
+    no longer referenced stay cached and are evicted in least-recently-used order once the
+    total size of all loaded models exceeds the memory budget.
+
+    Attributes:
+        max_memory (int): The memory budget in bytes, or None for no limit.
+    """
+
+    def __init__(self, max_memory=None):
+        """
+        Initializes an empty registry.
+
+        Args:
+            max_memory (int, optional): The memory budget in bytes. If None, unreferenced
+                                        models are kept until `clear` is called.
+        """
+        self.max_memory = max_memory
+        self._entries = OrderedDict()
+        self._load_locks = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(name, device=None, dtype=None):
+        """
+        Builds the registry key of a model, resolving the default device.
+
+        Args:
+            name (str): The name of the Whisper model.
+            device (str, optional): The torch device. If None, CUDA is used if available.
+            dtype (str, optional): The name of the torch dtype the weights are cast to.
+
+        Returns:
+            tuple: The key (name, device, dtype).
+        """
+        if device is None:
+            import torch
+
+            device = "cuda" if torch.cuda.is_available() else "cpu"
+        return (name, str(device), dtype)
+
+    def acquire(self, name, device=None, dtype=None):
+        """
+        Returns the requested model, loading it if it is not yet in the registry.
+
+        Every call must be matched by a call to `release`.
+
+        Args:
+            name (str): The name of the Whisper model.
+            device (str, optional): The torch device. If None, CUDA is used if available.
+            dtype (str, optional): The name of the torch dtype the weights are cast to, e.g. 'float16',
+                                   or 'int8' for a dynamically quantized model, see `transcribr.quantize`.
+
+        Returns:
+            whisper.Whisper: The shared model.
+
+        Raises:
+            ValueError: If an int8 model is requested on a device other than the CPU.
+        """
+        key = self.key(name, device, dtype)
+        with self._lock:
+            load_lock = self._load_locks.setdefault(key, threading.Lock())
+
+        with load_lock:
+            with self._lock:
+                entry = self._entries.get(key)
+                if entry is not None:
+                    entry.refcount += 1
+                    self._entries.move_to_end(key)
+                    return entry.model
+
+            logging.info(f"Loading Whisper model: {name}")
+            model = self._load(*key)
+            entry = _Entry(model, self._model_size(model))
+            entry.refcount = 1
+            with self._lock:
+                self._entries[key] = entry
+                self._evict()
+            return model
+
+    def release(self, name, device=None, dtype=None):
+        """
+        Releases a reference to a model acquired with `acquire`.
+
+        Args:
+            name (str): The name of the Whisper model.
+            device (str, optional): The torch device.
+            dtype (str, optional): The name of the torch dtype.
+        """
+        key = self.key(name, device, dtype)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry.refcount == 0:
+                return
+            entry.refcount -= 1
+            self._evict()
+
+    def lock(self, name, device=None, dtype=None):
+        """
+        Returns the lock that serializes inference on a shared model.
+
+        Args:
+            name (str): The name of the Whisper model.
+            device (str, optional): The torch device.
+            dtype (str, optional): The name of the torch dtype.
+
+        Returns:
+            threading.RLock: The inference lock of the model.
+
+        Raises:
+            KeyError: If the model is not loaded.
+        """
+        key = self.key(name, device, dtype)
+        with self._lock:
+            return self._entries[key].lock
+
+    def memory_usage(self):
+        """
+        Returns the total size of all loaded models.
+
+        Returns:
+            int: The size of all loaded models in bytes.
+        """
+        with self._lock:
+            return sum(entry.nbytes for entry in self._entries.values())
+
+    def set_memory_budget(self, max_memory):
+        """
+        Sets the memory budget and evicts unreferenced models exceeding it.
+
+        Args:
+            max_memory (int): The memory budget in bytes, or None for no limit.
+        """
+        with self._lock:
+            self.max_memory = max_memory
+            self._evict()
+
+    def clear(self):
+        """
+        Drops all unreferenced models from the registry.
+        """
+        with self._lock:
+            for key in [k for k, e in self._entries.items() if e.refcount == 0]:
+                del self._entries[key]
+
+    def _evict(self):
+        # must be called while holding self._lock
+        if self.max_memory is None:
+            return
+        total = sum(entry.nbytes for entry in self._entries.values())
+        for key in list(self._entries):
+            if total <= self.max_memory:
+                break
+            entry = self._entries[key]
+            if entry.refcount == 0:
+                logging.info(f"Evicting Whisper model: {key[0]}")
+                del self._entries[key]
+                total -= entry.nbytes
+
+    @staticmethod
+    def _load(name, device, dtype):
+        import torch
+        import whisper
+
+        if dtype == "int8":
+            from .quantize import load_quantized
+
+            if device != "cpu":
+                raise ValueError("int8 quantization is only supported on the CPU.")
+            return load_quantized(name)
+
+        model = whisper.load_model(name, device=device)
+        if dtype is not None:
+            model = model.to(getattr(torch, dtype))
+        return model
+
+    @staticmethod
+    def _model_size(model):
+        import torch
+
+        # the state dict also covers the packed weights of quantized layers
+        tensors = []
+        for value in model.state_dict().values():
+            tensors.extend(value if isinstance(value, tuple) else [value])
+        return sum(
+            t.numel() * t.element_size() for t in tensors if isinstance(t, torch.Tensor)
+        )
+
+
+# The registry shared by all Transcribr instances of this process.
+registry = ModelRegistry()
@@ -0,0 +1,132 @@
+import logging
+import os
+
+
+def available_cpus():
+    """
+    Returns the CPUs the current process may run on.
+
+    Returns:
+        list[int]: The ids of the CPUs, respecting the CPU affinity where supported.
+    """
+    if hasattr(os, "sched_getaffinity"):
+        return sorted(os.sched_getaffinity(0))
+    return list(range(os.cpu_count() or 1))
+
+
+def threads_per_worker(workers):
+    """
+    Divides the available CPUs evenly among worker processes.
+
+    Args:
+        workers (int): The number of worker processes sharing the CPUs.
+
+    Returns:
+        int: The number of threads per worker, at least 1.
+    """
+    return max(1, len(available_cpus()) // workers)
+
+
+def worker_cpus(index, workers, cpus=None):
+    """
+    Returns the share of the CPUs of one worker process.
+
+    The CPUs are divided into disjoint, contiguous slices, so workers do not compete for cores
+    and neighbouring cores (which often share caches) serve the same worker.
+
+    Args:
+        index (int): The index of the worker.
+        workers (int): The number of worker processes sharing the CPUs.
+        cpus (list[int], optional): The CPUs to divide. Defaults to the available CPUs.
+
+    Returns:
+        list[int]: The ids of the CPUs of the worker.
+    """
+    cpus = sorted(cpus) if cpus is not None else available_cpus()
+    size = max(1, len(cpus) // workers)
+    start = (index * size) % len(cpus)
+    return cpus[start : start + size]
+
+
+def resolve_device(device, index=0):
+    """
+    Resolves the 'auto' device of a worker.
+
+    Args:
+        device (str): The torch device, or 'auto' to spread workers over the available GPUs
+                      by their index and fall back to the CPU.
+        index (int): The index of the worker.
+
+    Returns:
+        str: The torch device.
+    """
+    if device != "auto":
+        return device
+    import torch
+
+    if torch.cuda.is_available():
+        return f"cuda:{index % torch.cuda.device_count()}"
+    return "cpu"
+
+
+def next_worker_index(counter):
+    """
+    Draws the next worker index from a counter shared between processes.
+
+    Args:
+        counter (multiprocessing.Value): An integer counter created by the parent process.
+
+    Returns:
+        int: The index of the calling worker.
+    """
+    with counter.get_lock():
+        index = counter.value
+        counter.value += 1
+    return index
+
+
+def configure(threads=None, interop_threads=None, affinity=None, workers=1, index=0):
+    """
+    Applies the torch thread counts and the CPU affinity of the current process.
+
+    These settings are process-wide. Settings that are None are left at their defaults.
+
+    Args:
+        threads (int | str, optional): The number of intra-op threads, or 'auto' for an equal share
+                                       of the CPUs among `workers`, or the number of pinned CPUs.
+        interop_threads (int, optional): The number of inter-op threads. Torch only accepts this
+                                         before it starts any parallel work.
+        affinity (Iterable[int] | str, optional): The CPUs to pin the process to, or 'auto' for the
+                                                  `index`-th share of the CPUs among `workers`.
+        workers (int): The number of worker processes sharing the node, for the 'auto' settings.
+        index (int): The index of the current worker, for the 'auto' settings.
+    """
+    import torch
+
+    cpus = None
+    if affinity == "auto":
+        cpus = worker_cpus(index, workers)
+    elif affinity is not None:
+        cpus = sorted(affinity)
+    if cpus is not None:
+        if hasattr(os, "sched_setaffinity"):
+            os.sched_setaffinity(0, cpus)
+        else:
+            logging.warning("CPU affinity is not supported on this platform.")
+
+    if threads == "auto":
+        threads = len(cpus) if cpus is not None else threads_per_worker(workers)
+    if threads is not None:
+        torch.set_num_threads(threads)
+
+    if (
+        interop_threads is not None
+        and torch.get_num_interop_threads() != interop_threads
+    ):
+        try:
+            torch.set_num_interop_threads(interop_threads)
+        except RuntimeError:
+            logging.warning(
+                f"Keeping {torch.get_num_interop_threads()} inter-op threads, since torch "
+                "only accepts the number before it starts parallel work."
+            )
@@ -0,0 +1,174 @@
+import logging
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+
+from .audio import load_audio
+
+
+class _Clip:
+    """
+    A submitted clip on its way through the scheduler.
+    """
+
+    def __init__(self, file_path):
+        self.file_path = file_path
+        self.future = Future()
+        self.submitted = time.perf_counter()
+        self.audio = None
+
+
+class ClipScheduler:
+    """
+    Transcribes many short clips in batches, with a bound on the time a clip waits for its batch.
+
+    Submitted clips are decoded concurrently on a thread pool. A dispatcher thread packs decoded
+    clips into batches for a `BatchedEngine` as soon as `batch_size` clips are ready, or once the
+    longest waiting clip has waited `max_wait` seconds since it was submitted. A batch consists
+    of that clip and the ready clips closest to it in length, so the windows of a batch need
+    a similar number of decoding steps and no clip is starved by a steady stream of others.
+
+    Attributes:
+        batch_size (int): The maximum number of clips per batch.
+        max_wait (float): The time in seconds after which a clip is dispatched in a partial batch.
+    """
+
+    def __init__(
+        self,
+        transcribr,
+        batch_size=16,
+        max_wait=0.5,
+        decode_workers=4,
+        max_pending=None,
+        language=None,
+    ):
+        """
+        Loads the model and starts the dispatcher.
+
+        Args:
+            transcribr (Transcribr): The instance whose model, device and probe cache are used.
+            batch_size (int): The maximum number of clips per batch.
+            max_wait (float): The time in seconds after which a clip is dispatched in a partial batch.
+            decode_workers (int): The number of threads decoding clips.
+            max_pending (int, optional): The number of clips that may be decoding or waiting for a batch.
+                                         `submit` blocks beyond it, bounding the memory of decoded audio.
+                                         Defaults to four batches.
+            language (str, optional): The language of the clips. If None, it is detected per clip.
+        """
+        assert max_wait >= 0, "max_wait must not be negative."
+        self.batch_size = batch_size
+        self.max_wait = max_wait
+        self._transcribr = transcribr
+        self._engine = transcribr.batched_engine(batch_size, language=language)
+        self._decoder = ThreadPoolExecutor(
+            max_workers=decode_workers, thread_name_prefix="transcribr-decode"
+        )
+        self._slots = threading.BoundedSemaphore(max_pending or 4 * batch_size)
+        self._ready = []
+        self._decoding = 0
+        self._closed = False
+        self._condition = threading.Condition()
+        self._dispatcher = threading.Thread(target=self._dispatch, daemon=True)
+        self._dispatcher.start()
+
+    def submit(self, file_path):
+        """
+        Queues a clip for transcription.
+
+        Args:
+            file_path (str): The path to the audio or video file.
+
+        Returns:
+            concurrent.futures.Future: A future resolving to the transcription of the clip, a dict
+                                       with 'text', 'segments' and 'language' like `transcription`.
+                                       It can be cancelled until the clip starts decoding.
+
+        Raises:
+            ValueError: If the scheduler is closed.
+        """
+        self._slots.acquire()
+        clip = _Clip(file_path)
+        with self._condition:
+            if self._closed:
+                self._slots.release()
+                raise ValueError("The scheduler is closed.")
+            self._decoding += 1
+        self._decoder.submit(self._decode, clip)
+        return clip.future
+
+    def _decode(self, clip):
+        # once running, the future can no longer be cancelled, so only the scheduler resolves it
+        if clip.future.set_running_or_notify_cancel():
+            try:
+                self._transcribr.probe_supported(clip.file_path)
+                clip.audio = load_audio(clip.file_path)
+            except Exception as e:
+                logging.error(f"Failed to decode '{clip.file_path}': {e}")
+                clip.future.set_exception(e)
+        with self._condition:
+            self._decoding -= 1
+            if clip.audio is not None:
+                self._ready.append(clip)
+            else:
+                self._slots.release()
+            self._condition.notify()
+
+    def _next_batch(self):
+        # must be called while holding self._condition; returns None once closed and drained
+        while True:
+            if self._ready:
+                oldest = min(self._ready, key=lambda c: c.submitted)
+                waited = time.perf_counter() - oldest.submitted
+                if (
+                    len(self._ready) >= self.batch_size
+                    or waited >= self.max_wait
+                    or (self._closed and not self._decoding)
+                ):
+                    break
+                self._condition.wait(self.max_wait - waited)
+            elif self._closed and not self._decoding:
+                return None
+            else:
+                self._condition.wait()
+
+        clips = sorted(self._ready, key=lambda c: len(c.audio))
+        i = clips.index(oldest)
+        start = max(0, min(i - self.batch_size // 2, len(clips) - self.batch_size))
+        batch = clips[start : start + self.batch_size]
+        for clip in batch:
+            self._ready.remove(clip)
+        return batch
+
+    def _dispatch(self):
+        while True:
+            with self._condition:
+                batch = self._next_batch()
+            if batch is None:
+                return
+            try:
+                transcriptions = self._engine.transcribe([c.audio for c in batch])
+                for clip, transcription in zip(batch, transcriptions):
+                    clip.future.set_result(transcription)
+            except Exception as e:
+                for clip in batch:
+                    clip.future.set_exception(e)
+            finally:
+                for clip in batch:
+                    clip.audio = None
+                    self._slots.release()
+
+    def close(self):
+        """
+        Transcribes all submitted clips without waiting for full batches and stops the scheduler.
+        """
+        with self._condition:
+            self._closed = True
+            self._condition.notify()
+        self._decoder.shutdown()
+        self._dispatcher.join()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
@@ -0,0 +1,377 @@
+"""
+A local HTTP server that keeps Whisper models resident and transcribes uploaded or local files.
+
+Run it with `transcribr-server` or `python -m transcribr.server`, then e.g.:
+
+    curl --data-binary @video.mp4 "http://127.0.0.1:8000/transcribe?format=srt"
+    curl -X POST "http://127.0.0.1:8000/transcribe?format=txt&path=/data/video.mp4"
+    curl "http://127.0.0.1:8000/health"
+"""
+
+import argparse
+import hashlib
+import io
+import json
+import logging
+import os
+import queue
+import sys
+import tempfile
+import threading
+from concurrent.futures import Future
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import ffmpeg
+
+from .cache import content_hash
+from .presets import PRESETS
+from .transcribr import MODELS, Transcribr
+
+# Content types of the supported response formats.
+FORMATS = {
+    "json": "application/json",
+    "txt": "text/plain; charset=utf-8",
+    "srt": "application/x-subrip; charset=utf-8",
+}
+
+
+class TranscriptionService:
+    """
+    Runs transcription jobs from a bounded queue on resident Transcribr instances.
+
+    Each worker thread holds its own Transcribr instance, while the model itself is shared
+    through the registry, so decoding of one job overlaps with inference of another.
+    Jobs for media with the same content hash and options are coalesced: while one is queued
+    or running, further submissions receive the future of that job instead of a new one.
+
+    Attributes:
+        queue (queue.Queue): The jobs waiting for a worker.
+    """
+
+    def __init__(
+        self, model="base", device=None, max_concurrency=1, queue_size=16, **options
+    ):
+        """
+        Loads the model and starts the worker threads.
+
+        Args:
+            model (str): The size of the Whisper model to use.
+            device (str, optional): The torch device to run the model on.
+            max_concurrency (int): The number of jobs processed at the same time.
+            queue_size (int): The number of jobs that may wait for a worker. Further jobs are rejected.
+            **options: Further arguments passed to `Transcribr`, e.g. 'dtype' or 'cache_dir'.
+        """
+        assert max_concurrency >= 1, "max_concurrency must be at least 1."
+        self.queue = queue.Queue(maxsize=queue_size)
+        self._pending = {}
+        self._lock = threading.Lock()
+        self._workers = []
+        for _ in range(max_concurrency):
+            transcribr = Transcribr(
+                model=model, device=device, in_memory=True, **options
+            )
+            transcribr.warmup()
+            thread = threading.Thread(target=self._run, args=(transcribr,), daemon=True)
+            thread.start()
+            self._workers.append((thread, transcribr))
+
+    def submit(self, file_path, key=None, vad=False, cleanup=False):
+        """
+        Queues the transcription of a file, or joins a pending job for the same content.
+
+        Args:
+            file_path (str): The path to the audio or video file.
+            key (str, optional): The content hash of the file. Computed if None.
+            vad (bool): Whether to skip silence before transcribing, see `Transcribr.transcribe`.
+            cleanup (bool): Whether to remove the file once it is no longer needed.
+
+        Returns:
+            concurrent.futures.Future: A future resolving to the transcription result.
+
+        Raises:
+            queue.Full: If the queue is full.
+        """
+        key = (key or content_hash(file_path), vad)
+        with self._lock:
+            future = self._pending.get(key)
+            if future is None:
+                future = Future()
+                self.queue.put_nowait((key, file_path, vad, cleanup, future))
+                self._pending[key] = future
+                return future
+        logging.info(f"Coalescing request for '{file_path}' with a pending job.")
+        if cleanup:
+            os.remove(file_path)
+        return future
+
+    def _run(self, transcribr):
+        while True:
+            job = self.queue.get()
+            if job is None:
+                break
+            key, file_path, vad, cleanup, future = job
+            try:
+                transcribr.transcribe(file_path, vad=vad)
+                future.set_result(transcribr.transcription)
+            except Exception as e:
+                future.set_exception(e)
+            finally:
+                with self._lock:
+                    del self._pending[key]
+                if cleanup:
+                    os.remove(file_path)
+
+    def status(self):
+        """
+        Describes the load of the service.
+
+        Returns:
+            dict: The number of queued and pending jobs and the concurrency limits.
+        """
+        return {
+            "queued": self.queue.qsize(),
+            "pending": len(self._pending),
+            "max_concurrency": len(self._workers),
+            "queue_size": self.queue.maxsize,
+        }
+
+    def close(self):
+        """
+        Stops the workers once the queued jobs are done and releases the models.
+        """
+        for _ in self._workers:
+            self.queue.put(None)
+        for thread, transcribr in self._workers:
+            thread.join()
+            transcribr.close()
+        self._workers = []
+
+
+def render(transcription, fmt):
+    """
+    Renders a transcription in one of the supported formats.
+
+    Args:
+        transcription (dict): The transcription result.
+        fmt (str): The format, 'json', 'txt' or 'srt'.
+
+    Returns:
+        str: The rendered transcription.
+    """
+    if fmt == "txt":
+        return Transcribr.split_sentences(transcription["text"])
+    if fmt == "srt":
+        buffer = io.StringIO()
+        Transcribr.write_srt(buffer, transcription["segments"])
+        return buffer.getvalue()
+    return json.dumps(transcription)
+
+
+class RequestHandler(BaseHTTPRequestHandler):
+    """
+    Handles `POST /transcribe` and `GET /health`.
+
+    `POST /transcribe` accepts the media as the request body, or a local file via the `path`
+    query parameter if the server allows it. The query parameters `format` ('json', 'txt' or
+    'srt', default 'json') and `vad` ('1' to skip silence) select the output.
+    """
+
+    server_version = "transcribr"
+
+    def do_GET(self):
+        if urlparse(self.path).path != "/health":
+            return self._send_error(HTTPStatus.NOT_FOUND, "Not found.")
+        self._send(HTTPStatus.OK, json.dumps(self.server.service.status()))
+
+    def do_POST(self):
+        url = urlparse(self.path)
+        if url.path != "/transcribe":
+            return self._send_error(HTTPStatus.NOT_FOUND, "Not found.")
+        params = {k: v[-1] for k, v in parse_qs(url.query).items()}
+        fmt = params.get("format", "json")
+        if fmt not in FORMATS:
+            return self._send_error(
+                HTTPStatus.BAD_REQUEST,
+                f"Invalid format. Choose from {', '.join(FORMATS)}.",
+            )
+        vad = params.get("vad", "0").lower() in ("1", "true")
+
+        if "path" in params:
+            if not self.server.allow_paths:
+                return self._send_error(
+                    HTTPStatus.FORBIDDEN, "Local paths are not allowed."
+                )
+            file_path, key, cleanup = params["path"], None, False
+            if not os.path.isfile(file_path):
+                return self._send_error(
+                    HTTPStatus.NOT_FOUND, f"File '{file_path}' not found."
+                )
+        else:
+            length = int(self.headers.get("Content-Length") or 0)
+            if not length:
+                return self._send_error(
+                    HTTPStatus.BAD_REQUEST,
+                    "Send the media as request body or pass a path.",
+                )
+            file_path, key = self._receive(length)
+            cleanup = True
+
+        try:
+            future = self.server.service.submit(file_path, key, vad, cleanup)
+        except queue.Full:
+            if cleanup:
+                os.remove(file_path)
+            return self._send_error(
+                HTTPStatus.SERVICE_UNAVAILABLE,
+                "Too many requests are queued. Retry later.",
+                {"Retry-After": "1"},
+            )
+
+        try:
+            transcription = future.result()
+        except (ValueError, ffmpeg.Error) as e:
+            return self._send_error(HTTPStatus.UNSUPPORTED_MEDIA_TYPE, str(e))
+        except Exception as e:
+            logging.error(f"Failed to transcribe '{file_path}': {e}")
+            return self._send_error(HTTPStatus.INTERNAL_SERVER_ERROR, str(e))
+        self._send(HTTPStatus.OK, render(transcription, fmt), FORMATS[fmt])
+
+    def _receive(self, length, block_size=1 << 20):
+        # writes the upload to a scratch file and hashes it like `content_hash` on the way
+        digest = hashlib.blake2b(digest_size=20)
+        fd, file_path = tempfile.mkstemp(
+            prefix="transcribr_upload_", dir=self.server.scratch_dir
+        )
+        try:
+            with os.fdopen(fd, "wb") as file:
+                while length > 0:
+                    block = self.rfile.read(min(block_size, length))
+                    if not block:
+                        raise ConnectionError("Incomplete upload.")
+                    digest.update(block)
+                    file.write(block)
+                    length -= len(block)
+        except BaseException:
+            os.remove(file_path)
+            raise
+        return file_path, digest.hexdigest()
+
+    def _send(self, status, body, content_type=FORMATS["json"], headers=None):
+        data = body.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _send_error(self, status, message, headers=None):
+        self._send(status, json.dumps({"error": message}), headers=headers)
+
+    def log_message(self, format, *args):
+        logging.info(f"{self.address_string()} - {format % args}")
+
+
+class TranscriptionServer(ThreadingHTTPServer):
+    """
+    A threading HTTP server that hands transcription requests to a `TranscriptionService`.
+
+    Attributes:
+        service (TranscriptionService): The service running the jobs.
+        allow_paths (bool): Whether clients may transcribe local files by path.
+        scratch_dir (str): The directory for uploaded files, or None for the system default.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, address, service, allow_paths=False, scratch_dir=None):
+        super().__init__(address, RequestHandler)
+        self.service = service
+        self.allow_paths = allow_paths
+        self.scratch_dir = scratch_dir
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="transcribr-server",
+        description="Serve transcriptions over HTTP with resident Whisper models.",
+    )
+    parser.add_argument("--host", default="127.0.0.1", help="Default: 127.0.0.1.")
+    parser.add_argument("--port", type=int, default=8000, help="Default: 8000.")
+    parser.add_argument(
+        "-m",
+        "--model",
+        default="base",
+        choices=MODELS,
+        help="The Whisper model to use (default: base).",
+    )
+    parser.add_argument("--device", help="The torch device, e.g. 'cpu' or 'cuda'.")
+    parser.add_argument(
+        "--preset",
+        choices=list(PRESETS),
+        help="The decoding preset trading speed for accuracy (default: Whisper's defaults).",
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=1,
+        help="Number of requests processed at the same time (default: 1).",
+    )
+    parser.add_argument(
+        "--queue-size",
+        type=int,
+        default=16,
+        help="Number of requests that may wait; further ones get 503 (default: 16).",
+    )
+    parser.add_argument(
+        "--allow-paths",
+        action="store_true",
+        help="Allow clients to transcribe local files by path.",
+    )
+    parser.add_argument("--cache-dir", help="Directory for caching transcriptions.")
+    parser.add_argument("--scratch-dir", help="Directory for uploads and audio files.")
+    args = parser.parse_args(argv)
+    if args.concurrency < 1:
+        parser.error("--concurrency must be at least 1.")
+    return args
+
+
+def main(argv=None):
+    """
+    Runs the transcription server until it is interrupted.
+
+    Args:
+        argv (list[str], optional): The command line arguments. Defaults to sys.argv.
+
+    Returns:
+        int: The exit code.
+    """
+    args = parse_args(argv)
+    service = TranscriptionService(
+        args.model,
+        args.device,
+        max_concurrency=args.concurrency,
+        queue_size=args.queue_size,
+        cache_dir=args.cache_dir,
+        preset=args.preset,
+        scratch_dir=args.scratch_dir,
+    )
+    server = TranscriptionServer(
+        (args.host, args.port), service, args.allow_paths, args.scratch_dir
+    )
+    logging.info(f"Serving on http://{args.host}:{server.server_port}...")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        service.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
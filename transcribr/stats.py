@@ -0,0 +1,81 @@
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+
+
+@dataclass
+class RunStats:
+    """
+    Timings of the stages of one transcription.
+
+    Attributes:
+        file_path (str): The path to the transcribed file.
+        model (str): The name of the model used.
+        stages (dict[str, float]): The time spent in each stage in seconds, e.g. 'probe',
+                                   'extraction', 'model_load', 'inference' or 'save_subtitles'.
+        audio_duration (float): The duration of the transcribed audio in seconds.
+        wall_time (float): The total time of the transcription in seconds, excluding saving.
+        preset (str): The decoding preset used, or None for Whisper's defaults.
+    """
+
+    file_path: str = None
+    model: str = None
+    stages: dict = field(default_factory=dict)
+    audio_duration: float = None
+    wall_time: float = None
+    preset: str = None
+    _started: float = field(default_factory=time.perf_counter, repr=False)
+
+    @property
+    def rtf(self):
+        """float: The real-time factor, i.e. the processing time per second of audio."""
+        if not self.audio_duration or self.wall_time is None:
+            return None
+        return self.wall_time / self.audio_duration
+
+    def add(self, stage, seconds):
+        """
+        Adds time to a stage.
+
+        Args:
+            stage (str): The name of the stage.
+            seconds (float): The time spent in the stage.
+        """
+        self.stages[stage] = self.stages.get(stage, 0.0) + seconds
+
+    @contextmanager
+    def stage(self, stage):
+        """
+        Measures the time spent in the body of the with-statement.
+
+        Args:
+            stage (str): The name of the stage.
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(stage, time.perf_counter() - start)
+
+    def finish(self):
+        """
+        Records the total time since the stats were created.
+        """
+        self.wall_time = time.perf_counter() - self._started
+
+    def to_dict(self):
+        """
+        Converts the stats into a JSON serializable dictionary.
+
+        Returns:
+            dict: The stats including the real-time factor.
+        """
+        return {
+            "file_path": self.file_path,
+            "model": self.model,
+            "stages": dict(self.stages),
+            "audio_duration": self.audio_duration,
+            "wall_time": self.wall_time,
+            "preset": self.preset,
+            "rtf": self.rtf,
+        }
@@ -1,8 +1,54 @@
-import whisper
+import io
 import os
-import ffmpeg
+import tempfile
+import threading
+import time
 from datetime import timedelta
 import logging
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from functools import partial
+
+from .audio import SAMPLE_RATE, aload_audio, audio_input, iter_audio, load_audio
+from .batch import BatchResult, expand_paths, output_base
+from .batched import BatchedEngine
+from .budget import plan, rtf_history
+from .cache import LanguageCache, TranscriptionCache, content_hash
+from .checkpoint import Checkpoint
+from .chunking import iter_chunks, shift_segments, split_audio, transcribe_parallel
+from .media import probe
+from .presets import PRESETS, resolve_preset
+from .quantize import QUANTIZATIONS
+from .registry import registry
+from .runtime import configure, resolve_device
+from .stats import RunStats
+
+# The sizes of the Whisper models that can be used.
+MODELS = ("tiny", "base", "small", "medium", "large", "turbo")
+
+# FFmpeg codecs of the PCM sample formats supported for extracted audio files.
+PCM_CODECS = {"s16le": "pcm_s16le", "f32le": "pcm_f32le"}
+
+# The number of threads of the executor shared by the asyncio API of all instances.
+ASYNC_WORKERS = 4
+
+# The length of the chunks in seconds after which a transcription with a deadline may stop.
+DEADLINE_CHUNK_LENGTH = 30.0
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def _shared_executor():
+    # created on first use, so importing transcribr does not start threads
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=ASYNC_WORKERS, thread_name_prefix="transcribr"
+            )
+        return _executor
+
 
 logging.basicConfig()
 logging.getLogger().setLevel(logging.INFO)
@@ -13,64 +59,1068 @@ class Transcribr:
     A class to handle transcription of audio and video files using the Whisper model.
 
     Attributes:
-        model (whisper.Whisper): The Whisper model used for transcription.
+        model (whisper.Whisper): The Whisper model used for transcription, shared via the model registry.
+                                 It is loaded lazily on first use.
+        model_name (str): The size of the Whisper model.
+        device (str): The torch device the model runs on, 'auto' until the model is loaded, or None for the default.
+        dtype (str): The torch dtype of the model weights, 'int8' for a quantized model, or None for the default.
         transcription (dict): The transcription result.
         file_path (str): The path to the input file.
+        in_memory (bool): Whether audio is decoded straight into memory instead of via a temporary file.
+        scratch_dir (str): The directory for temporary audio files, or None for the system default.
+        probe_cache_dir (str): The directory in which probe results are persisted, or None.
+        media_info (MediaInfo): The probe result of the input file.
+        cache (TranscriptionCache): The cache of previous transcriptions, or None.
+        last_run_stats (RunStats): The stage timings and real-time factor of the last transcription.
+        on_stats (Callable[[RunStats], None]): A hook called whenever `last_run_stats` is updated, or None.
+        executor (concurrent.futures.Executor): The executor running blocking work of the asyncio API, or None.
+        threads (int | str): The number of torch intra-op threads, 'auto', or None for the default.
+        interop_threads (int): The number of torch inter-op threads, or None for the default.
+        cpu_affinity (list[int] | str): The CPUs the process is pinned to, 'auto', or None.
+        node_workers (int): The number of worker processes sharing the node.
+        worker_index (int): The index of this worker among `node_workers`.
+        sample_format (str): The PCM sample format of extracted audio files, 's16le' or 'f32le'.
+        languages (LanguageCache): The languages detected per source, see `transcribe`.
+        preset (str): The decoding preset, 'fastest', 'balanced' or 'accurate', or None for Whisper's defaults.
+        decode_options (dict): Raw options of Whisper's `transcribe` that take precedence over the preset.
     """
 
-    def __init__(self, model="base"):
+    def __init__(
+        self,
+        model="base",
+        in_memory=False,
+        scratch_dir=None,
+        probe_cache_dir=None,
+        device=None,
+        dtype=None,
+        cache_dir=None,
+        cache_max_bytes=None,
+        on_stats=None,
+        sample_format="s16le",
+        executor=None,
+        quantize=None,
+        threads=None,
+        interop_threads=None,
+        cpu_affinity=None,
+        node_workers=1,
+        worker_index=0,
+        language_cache=None,
+        preset=None,
+        decode_options=None,
+    ):
         """
         Initializes the Transcribr class with the specified Whisper model.
 
         Args:
             model (str): The size of the Whisper model to use.
                          Options are 'tiny', 'base', 'small', 'medium', 'large', 'turbo'.
+            in_memory (bool): If True, FFmpeg's output is piped directly into a 16 kHz mono
+                              float32 array that is handed to the model, avoiding the temporary
+                              audio file and the second decode by Whisper.
+            scratch_dir (str, optional): The directory in which temporary audio files are created,
+                                         e.g. a tmpfs mount. If None, the system's temporary directory is used.
+            probe_cache_dir (str, optional): A directory in which probe results are persisted across runs,
+                                             keyed by path, modification time and size.
+            device (str, optional): The torch device to run the model on. If None, CUDA is used if available.
+                                    If 'auto', workers are spread over the GPUs by `worker_index`.
+            dtype (str, optional): The name of a torch dtype to cast the model weights to, e.g. 'float16'.
+            cache_dir (str, optional): A directory for caching transcriptions by the content of the media,
+                                       so identical files are only transcribed once, whatever their name.
+            cache_max_bytes (int, optional): The maximum size of the cache in bytes. The least recently
+                                             used transcriptions are evicted beyond it.
+            on_stats (Callable[[RunStats], None], optional): A hook called with `last_run_stats` when a
+                                                             transcription finishes and after each save.
+            sample_format (str): The PCM sample format of the 16 kHz mono WAV files extracted from videos.
+                                 Options are 's16le' and 'f32le'.
+            executor (concurrent.futures.Executor, optional): A bounded executor for probing, inference
+                                                              and saving in `atranscribe`, `asave_transcription`
+                                                              and `asave_subtitles`. If None, a thread pool of
+                                                              ASYNC_WORKERS threads shared by all instances is used.
+            quantize (str, optional): 'int8' to dynamically quantize the linear layers of the model for
+                                      faster CPU inference with a quarter of their memory, at a small loss
+                                      of accuracy. The quantized model is cached on disk, see
+                                      `transcribr.quantize`. Runs on the CPU and excludes `dtype`.
+            threads (int | str, optional): The number of torch intra-op threads. If 'auto', the CPUs are
+                                           divided evenly among `node_workers` processes, so that they do
+                                           not oversubscribe the cores.
+            interop_threads (int, optional): The number of torch inter-op threads.
+            cpu_affinity (Iterable[int] | str, optional): The CPUs to pin the process to. If 'auto', the
+                                                          `worker_index`-th share of the CPUs among
+                                                          `node_workers` processes is used.
+            node_workers (int): The number of worker processes sharing the node, for the 'auto' settings.
+            worker_index (int): The index of this worker process, for the 'auto' settings.
+            language_cache (str, optional): A JSON file in which the languages detected per source are
+                                            persisted across runs. If None, they are only kept in memory.
+            preset (str, optional): The decoding preset, see `transcribr.presets.PRESETS`. 'fastest' decodes
+                                    greedily without temperature fallback or conditioning on the previous
+                                    text, 'balanced' adds a short fallback ladder and 'accurate' uses beam
+                                    search with Whisper's full fallback ladder. If None, Whisper's defaults
+                                    are used.
+            decode_options (dict, optional): Raw options of Whisper's `transcribe`, e.g. 'beam_size' or
+                                             'compression_ratio_threshold', which take precedence over the preset.
+
+        Models are shared between all instances of a process through `transcribr.registry.registry`,
+        so constructing further instances with the same model, device and dtype does not reload the weights.
+        The model (and with it whisper and torch) is only loaded on the first transcription or by `warmup`,
+        which is also when the thread and affinity settings are applied to the process.
         """
-        assert model in [
-            "tiny",
-            "base",
-            "small",
-            "medium",
-            "large",
-            "turbo",
-        ], "Invalid model size. Choose from 'tiny', 'base', 'small', 'medium', 'large', or 'turbo'."
-
-        logging.info(f"Loading Whisper model: {model}")
-        self.model = whisper.load_model(model)
+        assert (
+            model in MODELS
+        ), "Invalid model size. Choose from 'tiny', 'base', 'small', 'medium', 'large', or 'turbo'."
+        assert (
+            sample_format in PCM_CODECS
+        ), "Invalid sample format. Choose from 's16le' or 'f32le'."
+        assert quantize in (
+            None,
+            *QUANTIZATIONS,
+        ), "Invalid quantization. Choose 'int8'."
+        assert quantize is None or dtype is None, "Pass either dtype or quantize."
+        assert node_workers >= 1, "node_workers must be at least 1."
+        assert (
+            preset is None or preset in PRESETS
+        ), f"Invalid preset. Choose from {', '.join(PRESETS)}."
+        if quantize is not None:
+            # quantized models are registered under their quantization instead of a dtype
+            dtype = quantize
+            device = "cpu" if device in (None, "auto") else device
+
+        self.model_name = model
+        self.device = device
+        self.dtype = dtype
+        self._model = None
+        self.in_memory = in_memory
+        self.scratch_dir = scratch_dir
+        self.probe_cache_dir = probe_cache_dir
         self.transcription = None
         self.file_path = None
+        self.media_info = None
+        self.cache = (
+            TranscriptionCache(cache_dir, cache_max_bytes)
+            if cache_dir is not None
+            else None
+        )
+        self.last_run_stats = None
+        self.on_stats = on_stats
+        self.sample_format = sample_format
+        self.executor = executor
+        self.threads = threads
+        self.interop_threads = interop_threads
+        self.cpu_affinity = cpu_affinity
+        self.node_workers = node_workers
+        self.worker_index = worker_index
+        self.languages = LanguageCache(language_cache)
+        self.preset = preset
+        self.decode_options = dict(decode_options or {})
 
-    def transcribe(self, file_path):
+    def transcribe(
+        self,
+        file_path,
+        workers=1,
+        chunk_length=120.0,
+        vad=False,
+        audio_stream=None,
+        start=None,
+        duration=None,
+        checkpoint=None,
+        batch_size=None,
+        language=None,
+        source=None,
+        preset=None,
+        decode_options=None,
+        deadline=None,
+    ):
         """
         Transcribes the audio from the given file using the Whisper model.
 
         Args:
             file_path (str): The path to the audio or video file to transcribe.
+            workers (int): The number of worker processes. If greater than 1, the audio is split
+                           into chunks at silence boundaries that are transcribed concurrently,
+                           each worker holding its own copy of the model.
+            chunk_length (float): The maximum length of a chunk in seconds if workers is greater than 1.
+            vad (bool): If True, silence, music intros and other non-speech regions are detected from
+                        frame energy and zero-crossing rate and removed before inference. Segment
+                        timestamps are mapped back to the original timeline.
+            audio_stream (int, optional): The index of the audio stream to transcribe among the audio
+                                          streams of the file. If None, FFmpeg picks the best one.
+            start (float, optional): The offset in seconds at which to start transcribing.
+            duration (float, optional): The maximum number of seconds to transcribe.
+            checkpoint (bool | str, optional): If given, the audio is transcribed sequentially in chunks of
+                                               `chunk_length` seconds, as by `transcribe_iter`, and the progress
+                                               is saved after every chunk to this path, or to '<file_path>.checkpoint'
+                                               if True. A later call with the same file and options resumes after
+                                               the last finished chunk and gives the same result as an
+                                               uninterrupted run. The checkpoint is deleted once the transcription
+                                               is complete. Not supported together with workers or vad.
+            batch_size (int, optional): If given, the audio is split into 30-second windows at silence
+                                        boundaries that are decoded in batches of this size by a
+                                        `BatchedEngine`, which is faster but decodes windows independently.
+            language (str, optional): The language of the audio, e.g. 'en', which skips language detection.
+                                      If None, the language is detected once per file, also if the audio
+                                      is transcribed in chunks or batches.
+            source (str, optional): The source of the file, e.g. the URL of a podcast feed. The language
+                                    detected for the first file of a source is reused for all later files
+                                    of the source, which then skip language detection.
+            preset (str, optional): The decoding preset for this call instead of `preset`.
+            decode_options (dict, optional): Raw options of Whisper's `transcribe` for this call, which take
+                                             precedence over the preset and `decode_options`. A 'language'
+                                             option is used unless `language` is given, and 'initial_prompt'
+                                             is the prompt of the first chunk, which later chunks replace by
+                                             the text of the previous one. Presets and options do not apply
+                                             to batched decoding, which always decodes greedily without
+                                             temperature fallback.
+            deadline (float, optional): The time in seconds the transcription may take. The runtime is
+                                        estimated from the audio duration and the real-time factors
+                                        measured in this process, see `transcribr.budget`. If the
+                                        budget is tight, a faster preset or a smaller model is used.
+                                        The audio is transcribed sequentially in chunks of
+                                        DEADLINE_CHUNK_LENGTH seconds, and if the next chunk would
+                                        not finish in time, the transcription stops with the segments
+                                        so far and 'partial' set to True. Not supported together with
+                                        workers, vad, checkpoints or batched decoding.
+
+        Segment timestamps are always relative to the start of the file, also if `start` is given.
 
         Raises:
             AssertionError: If the file does not exist.
         """
         assert os.path.exists(file_path), f"File '{file_path}' not found."
+        assert not checkpoint or (
+            workers == 1 and not vad
+        ), "Checkpoints are not supported together with workers or vad."
+        assert not batch_size or (
+            workers == 1 and not checkpoint
+        ), "Batched decoding is not supported together with workers or checkpoints."
+        assert deadline is None or (
+            workers == 1 and not vad and not checkpoint and not batch_size
+        ), "Deadlines are not supported together with workers, vad, checkpoints or batched decoding."
 
-        logging.info("Extracting audio from video...")
-        audio_path = self.extract_audio_from_file(file_path)
+        if deadline is not None:
+            deadline += time.perf_counter()
+        preset = preset or self.preset
+        stats = self.last_run_stats = RunStats(
+            file_path, self.model_name, preset=preset
+        )
+        resolved_options = self._decode_options(preset, decode_options)
+        options, language, prompt = self._split_context(resolved_options, language)
+        if language is None and source is not None:
+            language = self.languages.get(source)
 
-        logging.info("Transcribing audio...")
-        self.transcription = self.model.transcribe(audio_path)
+        cache_key = None
+        if self.cache is not None:
+            with stats.stage("cache_lookup"):
+                cache_options = {
+                    "dtype": self.dtype,
+                    "chunk_length": (
+                        DEADLINE_CHUNK_LENGTH
+                        if deadline is not None
+                        else chunk_length if workers > 1 or checkpoint else None
+                    ),
+                    "checkpoint": bool(checkpoint),
+                    "batched": bool(batch_size),
+                    "language": language,
+                    "decode_options": None if batch_size else resolved_options,
+                    "vad": vad,
+                    "audio_stream": audio_stream,
+                    "start": start,
+                    "duration": duration,
+                }
+                cache_key = self.cache.key(
+                    content_hash(file_path), self.model_name, cache_options
+                )
+                transcription = self.cache.get(cache_key)
+            if transcription is not None:
+                logging.info("Using cached transcription...")
+                with stats.stage("probe"):
+                    media_info = self.probe(file_path)
+                self._remember_language(source, transcription)
+                self._finish(stats, file_path, media_info, transcription)
+                return
+
+        extract_options = {
+            "stream_index": audio_stream,
+            "start": start,
+            "duration": duration,
+        }
+        if checkpoint:
+            with stats.stage("probe"):
+                media_info = self.probe_supported(file_path)
+            state = self._open_checkpoint(
+                checkpoint,
+                file_path,
+                chunk_length,
+                extract_options,
+                language,
+                resolved_options,
+            )
+            blocks = iter_audio(file_path, **extract_options)
+            for _ in self._iter_segments(
+                stats,
+                file_path,
+                media_info,
+                blocks,
+                chunk_length,
+                start,
+                state,
+                language,
+                source,
+                options,
+                prompt=prompt,
+            ):
+                pass
+            if cache_key is not None:
+                self.cache.put(cache_key, self.transcription)
+            return
+
+        if deadline is not None:
+            with stats.stage("probe"):
+                media_info = self.probe_supported(file_path)
+            model_name, stats.preset, rtf = plan(
+                self._selected_duration(media_info, start, duration) or 0.0,
+                deadline - time.perf_counter(),
+                self.model_name,
+                self.device,
+                preset,
+            )
+            degraded = (model_name, stats.preset) != (self.model_name, preset)
+            if degraded:
+                logging.info(
+                    f"Using the {model_name} model with the {stats.preset} preset to meet the deadline."
+                )
+            stats.model = model_name
+            # the planned preset is used as is, since None stands for Whisper's defaults
+            # rather than for the preset of the instance
+            planned_options, _, _ = self._split_context(
+                resolve_preset(stats.preset, self._raw_options(decode_options))
+            )
+            blocks = iter_audio(file_path, **extract_options)
+            with self._use_model(model_name):
+                for _ in self._iter_segments(
+                    stats,
+                    file_path,
+                    media_info,
+                    blocks,
+                    DEADLINE_CHUNK_LENGTH,
+                    start,
+                    None,
+                    language,
+                    source,
+                    planned_options,
+                    (deadline, rtf),
+                    prompt=prompt,
+                ):
+                    pass
+            # degraded and partial transcriptions must not be served to later calls
+            if (
+                cache_key is not None
+                and not degraded
+                and not self.transcription.get("partial")
+            ):
+                self.cache.put(cache_key, self.transcription)
+            return
+
+        regions = None
+        if self.in_memory or workers > 1 or vad or batch_size:
+            with stats.stage("probe"):
+                media_info = self.probe_supported(file_path)
+            logging.info("Decoding audio into memory...")
+            with stats.stage("extraction"):
+                audio = load_audio(file_path, **extract_options)
+            audio_duration = len(audio) / SAMPLE_RATE
+            if vad:
+                from .vad import detect_speech, remove_silence
+
+                with stats.stage("vad"):
+                    regions = detect_speech(audio)
+                    speech = remove_silence(audio, regions)
+                logging.info(
+                    f"Voice activity detection kept {len(speech) / max(len(audio), 1):.0%} of the audio."
+                )
+                audio = speech
+        else:
+            with stats.stage("probe"):
+                media_info = self.probe(file_path)
+            logging.info("Extracting audio from video...")
+            with stats.stage("extraction"):
+                audio = self.extract_audio_from_file(file_path, **extract_options)
+            audio_duration = self._selected_duration(media_info, start, duration)
+
+        try:
+            if language is None and (workers > 1 or batch_size):
+                # chunks and windows are decoded independently, so the language is detected
+                # once up front instead of once per chunk
+                with stats.stage("model_load"):
+                    self.warmup()
+                with stats.stage("language_detection"):
+                    language = self._detect_language(audio)
+            if workers > 1:
+                with stats.stage("inference"):
+                    transcription = transcribe_parallel(
+                        audio,
+                        self.model_name,
+                        device=self.device,
+                        dtype=self.dtype,
+                        workers=workers,
+                        chunk_length=chunk_length,
+                        cpu_affinity=self.cpu_affinity,
+                        language=language,
+                        initial_prompt=prompt,
+                        **options,
+                    )
+            elif batch_size:
+                with stats.stage("model_load"):
+                    engine = self.batched_engine(batch_size, language=language)
+                logging.info("Transcribing audio in batches...")
+                with stats.stage("inference"):
+                    transcription = engine.transcribe([audio])[0]
+            else:
+                with stats.stage("model_load"):
+                    self.warmup()
+                logging.info("Transcribing audio...")
+                with stats.stage("inference"):
+                    transcription = self._transcribe_audio(
+                        audio, language=language, initial_prompt=prompt, **options
+                    )
+        finally:
+            # remove the scratch file written by extract_audio_from_video
+            if isinstance(audio, str) and audio != file_path:
+                os.remove(audio)
+        if regions is not None:
+            from .vad import remap_segments
+
+            transcription["segments"] = remap_segments(
+                transcription["segments"], regions
+            )
+        if start:
+            transcription["segments"] = shift_segments(transcription["segments"], start)
+
+        self._remember_language(source, transcription)
+        if cache_key is not None:
+            self.cache.put(cache_key, transcription)
+        self._finish(stats, file_path, media_info, transcription, audio_duration)
+        # parallel, batched and vad runs do not reflect the speed of sequential inference
+        if workers == 1 and not batch_size and not vad:
+            self._record_rtf(stats)
+
+    @staticmethod
+    def _selected_duration(media_info, start=None, duration=None):
+        # the duration of the selected range of the file, or None if unknown
+        audio_duration = media_info.duration
+        if audio_duration is not None:
+            audio_duration = max(audio_duration - (start or 0.0), 0.0)
+            if duration is not None:
+                audio_duration = min(audio_duration, duration)
+        return audio_duration
+
+    def _record_rtf(self, stats):
+        inference = stats.stages.get("inference")
+        if inference and stats.audio_duration:
+            rtf_history.record(
+                stats.model, self.device, stats.preset, inference / stats.audio_duration
+            )
+
+    @contextmanager
+    def _use_model(self, name):
+        # temporarily runs this instance with another model of the registry
+        if name == self.model_name:
+            yield
+            return
+        model_name, model = self.model_name, self._model
+        self.model_name, self._model = name, None
+        try:
+            yield
+        finally:
+            self.close()
+            self.model_name, self._model = model_name, model
+
+    def detect_language(self, file_path, seconds=30.0, source=None):
+        """
+        Detects the spoken language from the beginning of a file.
+
+        Only the first `seconds` of the audio are decoded, and the language is detected from a
+        single mel window, which is much cheaper than a transcription.
+
+        Args:
+            file_path (str): The path to the audio or video file.
+            seconds (float): The number of seconds to decode; at most 30 are used.
+            source (str, optional): The source of the file. If its language is known, it is returned
+                                    without decoding the file, otherwise the result is stored for it.
+
+        Returns:
+            str: The language code, e.g. 'en'.
+
+        Raises:
+            AssertionError: If the file does not exist.
+        """
+        assert os.path.exists(file_path), f"File '{file_path}' not found."
+        language = self.languages.get(source) if source is not None else None
+        if language is None:
+            language = self._detect_language(load_audio(file_path, duration=seconds))
+            if source is not None:
+                self.languages.set(source, language)
+        return language
+
+    def _detect_language(self, audio):
+        import torch
+        import whisper
+
+        model = self.model
+        if not model.is_multilingual:
+            return "en"
+        mel = whisper.log_mel_spectrogram(
+            whisper.pad_or_trim(audio), model.dims.n_mels, device=model.device
+        )
+        if next(model.parameters()).dtype == torch.float16:
+            mel = mel.half()
+        with registry.lock(self.model_name, self.device, self.dtype):
+            _, probs = model.detect_language(mel)
+        language = max(probs, key=probs.get)
+        logging.info(f"Detected language: {language}")
+        return language
+
+    def _raw_options(self, decode_options=None):
+        # the raw options of the call are layered over those of the instance
+        return {**self.decode_options, **(decode_options or {})}
+
+    def _decode_options(self, preset=None, decode_options=None):
+        # the preset of the call replaces that of the instance, raw options are layered on top
+        return resolve_preset(preset or self.preset, self._raw_options(decode_options))
+
+    @staticmethod
+    def _split_context(options, language=None):
+        # every path passes 'language' and 'initial_prompt' to Whisper itself, so they are taken
+        # out of the raw options; an explicit language takes precedence over the options
+        options = dict(options)
+        option_language = options.pop("language", None)
+        return options, language or option_language, options.pop("initial_prompt", None)
+
+    def _remember_language(self, source, transcription):
+        if source is not None and transcription.get("language"):
+            self.languages.set(source, transcription["language"])
+
+    def _finish(self, stats, file_path, media_info, transcription, duration=None):
+        """
+        Stores the result of a transcription and reports its stats.
+
+        Args:
+            stats (RunStats): The stats of the transcription.
+            file_path (str): The path to the transcribed file.
+            media_info (MediaInfo): The probe result of the file.
+            transcription (dict): The transcription result.
+            duration (float, optional): The duration of the audio. Defaults to the probed duration.
+        """
+        self.transcription = transcription
         self.file_path = file_path
+        self.media_info = media_info
+        stats.audio_duration = duration if duration is not None else media_info.duration
+        stats.finish()
+        if stats.rtf is not None:
+            logging.info(
+                f"Transcribed {stats.audio_duration:.1f}s of audio in {stats.wall_time:.1f}s (RTF {stats.rtf:.3f})."
+            )
+        self._report_stats()
+
+    def _report_stats(self):
+        if self.on_stats is not None and self.last_run_stats is not None:
+            self.on_stats(self.last_run_stats)
+
+    @contextmanager
+    def _timed(self, stage):
+        # records the duration of a stage that runs after the transcription, e.g. saving
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            if self.last_run_stats is not None:
+                self.last_run_stats.add(stage, time.perf_counter() - start)
+
+    def transcribe_iter(
+        self,
+        file_path,
+        chunk_length=30.0,
+        audio_stream=None,
+        start=None,
+        duration=None,
+        checkpoint=None,
+        language=None,
+        source=None,
+    ):
+        """
+        Transcribes the given file incrementally, yielding segments as they are decoded.
+
+        The audio is streamed from FFmpeg and transcribed in chunks split at silence boundaries,
+        so the first segments are available after a few seconds and memory stays flat on long inputs.
+        The language detected in the first chunk and the text of the previous chunk are passed on
+        to the next chunk. Once the iterator is exhausted, `transcription` holds the full result.
+
+        Args:
+            file_path (str): The path to the audio or video file to transcribe.
+            chunk_length (float): The maximum length of a chunk in seconds.
+            audio_stream (int, optional): The index of the audio stream to transcribe.
+            start (float, optional): The offset in seconds at which to start transcribing.
+            duration (float, optional): The maximum number of seconds to transcribe.
+            checkpoint (bool | str, optional): A path to save the progress to after every chunk, or True
+                                               for '<file_path>.checkpoint', see `transcribe`. When resuming,
+                                               the segments restored from the checkpoint are yielded first.
+            language (str, optional): The language of the audio. If None, it is detected in the first chunk.
+            source (str, optional): The source of the file for the language cache, see `transcribe`.
+
+        Returns:
+            Iterator[dict]: The transcribed segments with timestamps relative to the start of the file.
+
+        Raises:
+            AssertionError: If the file does not exist.
+            ValueError: If the file type is unsupported.
+        """
+        assert os.path.exists(file_path), f"File '{file_path}' not found."
+
+        stats = self.last_run_stats = RunStats(
+            file_path, self.model_name, preset=self.preset
+        )
+        decode_options = self._decode_options()
+        options, language, prompt = self._split_context(decode_options, language)
+        if language is None and source is not None:
+            language = self.languages.get(source)
+        with stats.stage("probe"):
+            media_info = self.probe_supported(file_path)
+        self.transcription = None
+        self.file_path = file_path
+        self.media_info = media_info
+        extract_options = {
+            "stream_index": audio_stream,
+            "start": start,
+            "duration": duration,
+        }
+        state = None
+        if checkpoint:
+            state = self._open_checkpoint(
+                checkpoint,
+                file_path,
+                chunk_length,
+                extract_options,
+                language,
+                decode_options,
+            )
+        blocks = iter_audio(file_path, **extract_options)
+        return self._iter_segments(
+            stats,
+            file_path,
+            media_info,
+            blocks,
+            chunk_length,
+            start,
+            state,
+            language,
+            source,
+            options,
+            prompt=prompt,
+        )
+
+    def _open_checkpoint(
+        self,
+        checkpoint,
+        file_path,
+        chunk_length,
+        extract_options,
+        language=None,
+        decode_options=None,
+    ):
+        path = checkpoint if isinstance(checkpoint, str) else f"{file_path}.checkpoint"
+        options = {
+            "dtype": self.dtype,
+            "chunk_length": chunk_length,
+            "language": language,
+            "decode_options": decode_options,
+            **extract_options,
+        }
+        return Checkpoint(path, Checkpoint.key(file_path, self.model_name, options))
+
+    def _iter_segments(
+        self,
+        stats,
+        file_path,
+        media_info,
+        blocks,
+        chunk_length,
+        offset,
+        checkpoint,
+        language=None,
+        source=None,
+        options=None,
+        deadline=None,
+        prompt=None,
+    ):
+        # options are the decoding options without 'language' and 'initial_prompt', see
+        # _split_context; deadline is a tuple of the perf_counter time to finish by and the
+        # expected RTF
+        options = options or {}
+        segments = []
+        partial = False
+        samples = 0
+        done = 0
+        try:
+            if checkpoint is not None:
+                language = checkpoint.language or language
+                prompt = checkpoint.prompt or prompt
+                done = checkpoint.samples
+                for segment in checkpoint.segments:
+                    segments.append(segment)
+                    yield segment
+            with stats.stage("model_load"):
+                self.warmup()
+            logging.info("Transcribing audio stream...")
+            chunks = iter_chunks(blocks, chunk_length)
+            while True:
+                with stats.stage("extraction"):
+                    item = next(chunks, None)
+                if item is None:
+                    break
+                start, chunk = item
+                samples = start + len(chunk)
+                if samples <= done:
+                    # the chunk is in the checkpoint; the audio before it is decoded again instead
+                    # of seeking, so the following chunks are split exactly as in the first run
+                    continue
+                if deadline is not None:
+                    deadline_time, rtf = deadline
+                    if start:
+                        # the speed measured so far supersedes the estimate
+                        rtf = stats.stages.get("inference", 0.0) * SAMPLE_RATE / start
+                    if (
+                        time.perf_counter() + rtf * len(chunk) / SAMPLE_RATE
+                        > deadline_time
+                    ):
+                        logging.warning(
+                            f"Stopping after {start / SAMPLE_RATE:.1f}s of audio to meet the deadline."
+                        )
+                        partial = True
+                        samples = start
+                        chunks.close()
+                        blocks.close()
+                        break
+                with stats.stage("inference"):
+                    result = self._transcribe_audio(
+                        chunk, language=language, initial_prompt=prompt, **options
+                    )
+                language = language or result.get("language")
+                prompt = result["text"] or prompt
+                new_segments = shift_segments(
+                    result["segments"], (offset or 0.0) + start / SAMPLE_RATE
+                )
+                for segment in new_segments:
+                    segment["id"] = len(segments)
+                    segments.append(segment)
+                if checkpoint is not None:
+                    checkpoint.record(new_segments, samples, language, prompt)
+                yield from new_segments
+            if checkpoint is not None and not partial:
+                checkpoint.remove()
+        finally:
+            if checkpoint is not None:
+                checkpoint.close()
+
+        transcription = {
+            "text": "".join(segment["text"] for segment in segments),
+            "segments": segments,
+            "language": language,
+        }
+        if partial:
+            transcription["partial"] = True
+        self._remember_language(source, transcription)
+        self._finish(stats, file_path, media_info, transcription, samples / SAMPLE_RATE)
+        self._record_rtf(stats)
+
+    def transcribe_batch(
+        self,
+        paths_or_glob,
+        output_dir=None,
+        formats=("txt", "srt"),
+        decode_workers=2,
+        prefetch=2,
+    ):
+        """
+        Transcribes many files, decoding upcoming files in the background during inference.
 
-    def save_transcription(self, output_file=None):
+        FFmpeg decodes the next `prefetch` files into memory on background threads while the
+        model transcribes the current file, and one loaded model is reused for all files.
+        Errors are recorded per file instead of aborting the batch.
+
+        Args:
+            paths_or_glob (str | Iterable[str]): Files, directories (searched recursively) or glob patterns.
+            output_dir (str, optional): The directory to write the outputs to, keeping the relative
+                                        directory structure of the inputs. If None, outputs are written
+                                        next to the input files.
+            formats (Iterable[str]): The output formats to write. Options are 'txt' and 'srt'.
+            decode_workers (int): The number of threads decoding audio in the background.
+            prefetch (int): The number of files decoded ahead of the current one.
+
+        Returns:
+            list[BatchResult]: The result of each file in sorted order, including its stats.
+        """
+        savers = {"txt": self.save_transcription, "srt": self.save_subtitles}
+        assert set(formats) <= set(
+            savers
+        ), f"Invalid format. Choose from {', '.join(savers)}."
+
+        files = expand_paths(paths_or_glob)
+        logging.info(f"Transcribing {len(files)} files...")
+
+        def decode(file_path):
+            stats = RunStats(file_path, self.model_name, preset=self.preset)
+            with stats.stage("probe"):
+                media_info = self.probe_supported(file_path)
+            with stats.stage("extraction"):
+                audio = load_audio(file_path)
+            return stats, media_info, audio
+
+        results = []
+        with ThreadPoolExecutor(max_workers=decode_workers) as pool:
+            pending = [pool.submit(decode, f) for f in files[: prefetch + 1]]
+            for i, file_path in enumerate(files):
+                if i + prefetch + 1 < len(files):
+                    pending.append(pool.submit(decode, files[i + prefetch + 1]))
+                result = BatchResult(file_path)
+                try:
+                    stats, media_info, audio = pending[i].result()
+                    # drop the reference so the decoded audio can be freed
+                    pending[i] = None
+                    # time spent decoding in the background does not count towards this run
+                    stats = RunStats(
+                        file_path,
+                        self.model_name,
+                        dict(stats.stages),
+                        preset=self.preset,
+                    )
+                    self.last_run_stats = result.stats = stats
+                    with stats.stage("model_load"):
+                        self.warmup()
+                    logging.info(f"Transcribing '{file_path}'...")
+                    with stats.stage("inference"):
+                        transcription = self._transcribe_audio(
+                            audio, **self._decode_options()
+                        )
+                    self._finish(
+                        stats,
+                        file_path,
+                        media_info,
+                        transcription,
+                        len(audio) / SAMPLE_RATE,
+                    )
+                    self._record_rtf(stats)
+                    result.transcription = transcription
+
+                    base = output_base(file_path, files, output_dir)
+                    for fmt in formats:
+                        output_file = f"{base}.{fmt}"
+                        savers[fmt](output_file)
+                        result.outputs.append(output_file)
+                except Exception as e:
+                    logging.error(f"Failed to transcribe '{file_path}': {e}")
+                    result.error = e
+                results.append(result)
+        return results
+
+    async def atranscribe(
+        self,
+        file_path,
+        chunk_length=30.0,
+        vad=False,
+        audio_stream=None,
+        start=None,
+        duration=None,
+        language=None,
+        source=None,
+    ):
+        """
+        Transcribes the given file without blocking the event loop.
+
+        The asynchronous counterpart of `transcribe`. FFmpeg runs in an asyncio subprocess and
+        inference runs chunk by chunk on the executor, so the loop stays responsive and many
+        jobs can be awaited concurrently while the number of threads stays bounded.
+        If the task is cancelled, FFmpeg is killed, or no further chunk is transcribed once the
+        current one is done. Use one instance per concurrent job; the model is still shared.
+
+        Args:
+            file_path (str): The path to the audio or video file to transcribe.
+            chunk_length (float): The maximum length of a chunk in seconds. Chunks are split at
+                                  silence boundaries, see `transcribe_iter`.
+            vad (bool): If True, non-speech regions are removed before inference, see `transcribe`.
+            audio_stream (int, optional): The index of the audio stream to transcribe.
+            start (float, optional): The offset in seconds at which to start transcribing.
+            duration (float, optional): The maximum number of seconds to transcribe.
+            language (str, optional): The language of the audio. If None, it is detected in the first chunk.
+            source (str, optional): The source of the file for the language cache, see `transcribe`.
+
+        Returns:
+            dict: The transcription result, which is also stored in `transcription`.
+
+        Raises:
+            AssertionError: If the file does not exist.
+            ValueError: If the file type is unsupported.
+            RuntimeError: If FFmpeg fails to decode the file.
+        """
+        import asyncio
+
+        assert os.path.exists(file_path), f"File '{file_path}' not found."
+
+        loop = asyncio.get_running_loop()
+        executor = self.executor or _shared_executor()
+        stats = self.last_run_stats = RunStats(
+            file_path, self.model_name, preset=self.preset
+        )
+        options, language, prompt = self._split_context(
+            self._decode_options(), language
+        )
+        if language is None and source is not None:
+            language = self.languages.get(source)
+        with stats.stage("probe"):
+            media_info = await loop.run_in_executor(
+                executor, self.probe_supported, file_path
+            )
+        logging.info("Decoding audio into memory...")
+        with stats.stage("extraction"):
+            audio = await aload_audio(
+                file_path, stream_index=audio_stream, start=start, duration=duration
+            )
+        audio_duration = len(audio) / SAMPLE_RATE
+        regions = None
+        if vad:
+            from .vad import detect_speech, remove_silence
+
+            with stats.stage("vad"):
+                regions = await loop.run_in_executor(executor, detect_speech, audio)
+                audio = remove_silence(audio, regions)
+
+        with stats.stage("model_load"):
+            await loop.run_in_executor(executor, self.warmup)
+        logging.info("Transcribing audio...")
+        segments = []
+        for begin, end in split_audio(audio, chunk_length):
+            transcribe = partial(
+                self._transcribe_audio,
+                audio[begin:end],
+                language=language,
+                initial_prompt=prompt,
+                **options,
+            )
+            with stats.stage("inference"):
+                result = await loop.run_in_executor(executor, transcribe)
+            language = language or result.get("language")
+            prompt = result["text"] or prompt
+            segments.extend(shift_segments(result["segments"], begin / SAMPLE_RATE))
+
+        if regions is not None:
+            from .vad import remap_segments
+
+            segments = remap_segments(segments, regions)
+        if start:
+            segments = shift_segments(segments, start)
+        for i, segment in enumerate(segments):
+            segment["id"] = i
+        transcription = {
+            "text": "".join(segment["text"] for segment in segments),
+            "segments": segments,
+            "language": language,
+        }
+        self._remember_language(source, transcription)
+        self._finish(stats, file_path, media_info, transcription, audio_duration)
+        if not vad:
+            self._record_rtf(stats)
+        return transcription
+
+    def batched_engine(self, batch_size=8, **options):
+        """
+        Creates a batched engine on the shared model of this instance.
+
+        Args:
+            batch_size (int): The number of 30-second windows decoded per pass.
+            **options: Further arguments passed to `BatchedEngine`, e.g. 'language'.
+
+        Returns:
+            BatchedEngine: The engine, holding the inference lock of the model during every pass.
+        """
+        model = self.model
+        lock = registry.lock(self.model_name, self.device, self.dtype)
+        return BatchedEngine(model, batch_size, lock=lock, **options)
+
+    def _transcribe_audio(self, audio, **options):
+        """
+        Runs the shared model on the given audio while holding its inference lock.
+
+        Args:
+            audio (str | np.ndarray): The path to an audio file or the decoded audio.
+            **options: Further options passed to `model.transcribe`.
+
+        Returns:
+            dict: The transcription result.
+        """
+        model = self.model
+        with registry.lock(self.model_name, self.device, self.dtype):
+            return model.transcribe(audio, **options)
+
+    @property
+    def model(self):
+        """
+        The Whisper model, acquired from the registry on first access.
+        """
+        if self._model is None:
+            configure(
+                self.threads,
+                self.interop_threads,
+                self.cpu_affinity,
+                self.node_workers,
+                self.worker_index,
+            )
+            self.device = resolve_device(self.device, self.worker_index)
+            self._model = registry.acquire(
+                self.model_name, device=self.device, dtype=self.dtype
+            )
+        return self._model
+
+    def warmup(self):
+        """
+        Loads the model ahead of the first transcription.
+        """
+        self.model
+
+    def close(self):
+        """
+        Releases the model back to the registry.
+
+        The model stays cached in the registry until it is evicted, so it can be reused
+        by instances created later.
+        """
+        if self._model is not None:
+            registry.release(self.model_name, self.device, self.dtype)
+            self._model = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def __del__(self):
+        try:
+            self.close()
+        except Exception:
+            pass
+
+    def save_transcription(self, output_file=None, segments=None):
         """
         Saves the transcription to a text file.
 
         Args:
             output_file (str, optional): The path to save the transcription file.
                                          If None, saves to the same directory as the input file with a .txt extension.
+            segments (Iterable[dict], optional): A stream of segments, e.g. from `transcribe_iter`,
+                                                 that is written progressively as segments arrive.
+                                                 If None, the stored transcription is saved.
 
         Raises:
             ValueError: If no transcription is available.
         """
-        if self.transcription is None:
+        if segments is None and self.transcription is None:
             raise ValueError(
                 "No transcription available. Please transcribe audio first."
             )
@@ -78,37 +1128,92 @@ class Transcribr:
         output_file = self.output_file(self.file_path, output_file, extension=".txt")
 
         logging.info("Saving transcription...")
-        text = self.transcription["text"]
-        text = text.replace(". ", ".\n").replace("? ", "?\n").replace("! ", "!\n")
-        with open(output_file, "w", encoding="utf-8") as file:
-            file.write(text)
+        with (
+            self._timed("save_transcription"),
+            open(output_file, "w", encoding="utf-8") as file,
+        ):
+            if segments is None:
+                file.write(self.split_sentences(self.transcription["text"]))
+            else:
+                # hold back the last character, since a sentence break may span two segments
+                pending = ""
+                for segment in segments:
+                    text = self.split_sentences(pending + segment["text"])
+                    file.write(text[:-1])
+                    file.flush()
+                    pending = text[-1:]
+                file.write(pending)
 
         logging.info(f"Transcription file '{output_file}' generated successfully.")
+        self._report_stats()
 
-    def save_subtitles(self, output_file=None):
+    def save_subtitles(self, output_file=None, segments=None):
         """
         Saves the transcription as a subtitle file in SRT format.
 
         Args:
             output_file (str, optional): The path to save the subtitle file.
                                          If None, saves to the same directory as the input file with a .srt extension.
+            segments (Iterable[dict], optional): A stream of segments, e.g. from `transcribe_iter`,
+                                                 that is written progressively as segments arrive.
+                                                 If None, the stored transcription is saved.
 
         Raises:
             ValueError: If no transcription is available.
         """
-        if self.transcription is None:
-            raise ValueError(
-                "No transcription available. Please transcribe audio first."
-            )
-
-        logging.info("Generating SRT file...")
-        srt_content = self.generate_srt(self.transcription)
+        progressive = segments is not None
+        if not progressive:
+            if self.transcription is None:
+                raise ValueError(
+                    "No transcription available. Please transcribe audio first."
+                )
+            segments = self.transcription["segments"]
 
         output_file = self.output_file(self.file_path, output_file, extension=".srt")
 
-        self.save_srt_file(output_file, srt_content)
+        logging.info("Generating SRT file...")
+        with (
+            self._timed("save_subtitles"),
+            open(output_file, "w", encoding="utf-8") as file,
+        ):
+            self.write_srt(file, segments, flush=progressive)
 
         logging.info(f"Subtitle file '{output_file}' generated successfully.")
+        self._report_stats()
+
+    async def asave_transcription(self, output_file=None):
+        """
+        Saves the transcription to a text file without blocking the event loop.
+
+        Args:
+            output_file (str, optional): The path to save the transcription file, see `save_transcription`.
+
+        Raises:
+            ValueError: If no transcription is available.
+        """
+        import asyncio
+
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(
+            self.executor or _shared_executor(), self.save_transcription, output_file
+        )
+
+    async def asave_subtitles(self, output_file=None):
+        """
+        Saves the subtitles to an SRT file without blocking the event loop.
+
+        Args:
+            output_file (str, optional): The path to save the SRT file, see `save_subtitles`.
+
+        Raises:
+            ValueError: If no transcription is available.
+        """
+        import asyncio
+
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(
+            self.executor or _shared_executor(), self.save_subtitles, output_file
+        )
 
     def output_file(self, file_path, output_file=None, extension=".txt"):
         """
@@ -125,19 +1230,26 @@ class Transcribr:
         if output_file is None:
             output_file = os.path.splitext(file_path)[0] + extension
         else:
-            dir, file = os.path.split(output_file)
-            if not dir:
-                dir, _ = os.path.splitext(file_path)
-            os.makedirs(dir, exist_ok=True)
+            # a bare file name is written to the working directory, which exists
+            dir = os.path.dirname(output_file)
+            if dir:
+                os.makedirs(dir, exist_ok=True)
 
         return output_file
 
-    def extract_audio_from_file(self, file_path):
+    def extract_audio_from_file(
+        self, file_path, stream_index=None, start=None, duration=None
+    ):
         """
         Extracts audio from the given file.
 
+        Audio files are used as they are, unless a stream or time range is selected.
+
         Args:
             file_path (str): The path to the input file.
+            stream_index (int, optional): The index of the audio stream to extract.
+            start (float, optional): The offset in seconds at which to start extracting.
+            duration (float, optional): The maximum number of seconds to extract.
 
         Returns:
             str: The path to the extracted audio file.
@@ -145,14 +1257,49 @@ class Transcribr:
         Raises:
             ValueError: If the file type is unsupported.
         """
-        if self.is_video_file(file_path):
-            return self.extract_audio_from_video(file_path)
-        elif self.is_audio_file(file_path):
-            return file_path
-        else:
+        selected = stream_index is not None or start or duration is not None
+        if self.probe_supported(file_path).has_video or selected:
+            return self.extract_audio_from_video(
+                file_path,
+                scratch_dir=self.scratch_dir,
+                sample_format=self.sample_format,
+                stream_index=stream_index,
+                start=start,
+                duration=duration,
+            )
+        return file_path
+
+    def probe(self, file_path):
+        """
+        Probes the given file once and caches the result for all later stages.
+
+        Args:
+            file_path (str): The path to the input file.
+
+        Returns:
+            MediaInfo: The streams, duration and format of the file.
+        """
+        return probe(file_path, cache_dir=self.probe_cache_dir)
+
+    def probe_supported(self, file_path):
+        """
+        Probes the given file and checks that it contains video or audio.
+
+        Args:
+            file_path (str): The path to the input file.
+
+        Returns:
+            MediaInfo: The streams, duration and format of the file.
+
+        Raises:
+            ValueError: If the file type is unsupported.
+        """
+        media_info = self.probe(file_path)
+        if not (media_info.has_video or media_info.has_audio):
             raise ValueError(
                 "Unsupported file type. Please provide a video or audio file."
             )
+        return media_info
 
     def is_video_file(self, file_path):
         """
@@ -164,12 +1311,7 @@ class Transcribr:
         Returns:
             bool: True if the file is a video file, False otherwise.
         """
-        try:
-            metadata = ffmpeg.probe(file_path, select_streams="v")["streams"][0]
-            if metadata["codec_type"] == "video":
-                return True
-        except IndexError:
-            return False
+        return self.probe(file_path).has_video
 
     def is_audio_file(self, file_path):
         """
@@ -181,24 +1323,63 @@ class Transcribr:
         Returns:
             bool: True if the file is an audio file, False otherwise.
         """
-        metadata = ffmpeg.probe(file_path, select_streams="a")["streams"][0]
-        return metadata["codec_type"] == "audio"
+        return self.probe(file_path).has_audio
 
     @staticmethod
-    def extract_audio_from_video(video_path, audio_path="temp_audio.wav"):
+    def extract_audio_from_video(
+        video_path,
+        audio_path=None,
+        scratch_dir=None,
+        sample_rate=SAMPLE_RATE,
+        sample_format="s16le",
+        stream_index=None,
+        start=None,
+        duration=None,
+    ):
         """
         Extracts audio from a video file using FFmpeg.
 
+        The audio is downmixed to mono and resampled to Whisper's 16 kHz, so the WAV file is
+        a fraction of the size of the original track and Whisper does not resample it again.
+
         Args:
             video_path (str): The path to the video file.
-            audio_path (str): The path to save the extracted audio file.
+            audio_path (str, optional): The path to save the extracted audio file.
+                                        If None, a uniquely named scratch file is created, so that
+                                        concurrent extractions never overwrite each other.
+            scratch_dir (str, optional): The directory for the scratch file if no audio_path is given.
+            sample_rate (int): The sample rate of the extracted audio.
+            sample_format (str): The PCM sample format, 's16le' or 'f32le'.
+            stream_index (int, optional): The index of the audio stream to extract among the audio
+                                          streams of the file. If None, FFmpeg picks the best one.
+            start (float, optional): The offset in seconds at which to start extracting.
+            duration (float, optional): The maximum number of seconds to extract.
 
         Returns:
             str: The path to the extracted audio file.
         """
-        ffmpeg.input(video_path).output(audio_path, format="wav").run(
-            overwrite_output=True
-        )
+        assert (
+            sample_format in PCM_CODECS
+        ), "Invalid sample format. Choose from 's16le' or 'f32le'."
+        is_scratch = audio_path is None
+        if is_scratch:
+            fd, audio_path = tempfile.mkstemp(
+                prefix="transcribr_", suffix=".wav", dir=scratch_dir
+            )
+            os.close(fd)
+
+        try:
+            audio_input(video_path, stream_index, start, duration).output(
+                audio_path,
+                format="wav",
+                acodec=PCM_CODECS[sample_format],
+                ac=1,
+                ar=sample_rate,
+            ).run(overwrite_output=True)
+        except BaseException:
+            if is_scratch:
+                os.remove(audio_path)
+            raise
         return audio_path
 
     @staticmethod
@@ -220,6 +1401,36 @@ class Transcribr:
         seconds = total_seconds % 60
         return f"{hours:02}:{minutes:02}:{seconds:02},{milliseconds:03}"
 
+    @staticmethod
+    def split_sentences(text):
+        """
+        Puts every sentence of the given text on its own line.
+
+        Args:
+            text (str): The transcribed text.
+
+        Returns:
+            str: The text with line breaks after sentence-ending punctuation.
+        """
+        return text.replace(". ", ".\n").replace("? ", "?\n").replace("! ", "!\n")
+
+    @classmethod
+    def format_srt_entry(cls, index, segment):
+        """
+        Formats a single segment as an SRT entry.
+
+        Args:
+            index (int): The 1-based number of the entry.
+            segment (dict): The segment with 'start', 'end' and 'text'.
+
+        Returns:
+            str: The SRT entry including the trailing blank line.
+        """
+        start_time = cls.format_timedelta(segment["start"])
+        end_time = cls.format_timedelta(segment["end"])
+        text = segment["text"].strip()
+        return f"{index}\n{start_time} --> {end_time}\n{text}\n\n"
+
     def generate_srt(self, transcription):
         """
         Generates SRT content from the transcription output.
@@ -230,13 +1441,25 @@ class Transcribr:
         Returns:
             str: The generated SRT content.
         """
-        srt_content = ""
-        for i, segment in enumerate(transcription["segments"]):
-            start_time = self.format_timedelta(segment["start"])
-            end_time = self.format_timedelta(segment["end"])
-            text = segment["text"].strip()
-            srt_content += f"{i + 1}\n{start_time} --> {end_time}\n{text}\n\n"
-        return srt_content
+        buffer = io.StringIO()
+        self.write_srt(buffer, transcription["segments"])
+        return buffer.getvalue()
+
+    @classmethod
+    def write_srt(cls, file, segments, flush=False):
+        """
+        Writes segments as SRT entries to an open text file, one entry at a time.
+
+        Args:
+            file (TextIO): The file or buffer to write to.
+            segments (Iterable[dict]): The segments with 'start', 'end' and 'text'.
+            flush (bool): Whether to flush the file after each entry, so that partial
+                          results of a stream are visible on disk immediately.
+        """
+        for i, segment in enumerate(segments):
+            file.write(cls.format_srt_entry(i + 1, segment))
+            if flush:
+                file.flush()
 
     @staticmethod
     def save_srt_file(filename, srt_content):
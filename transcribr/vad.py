@@ -0,0 +1,166 @@
+import numpy as np
+
+from .audio import SAMPLE_RATE
+
+
+def frame_features(audio, frame_length):
+    """
+    Computes the log energy and zero-crossing rate of non-overlapping frames.
+
+    Args:
+        audio (np.ndarray): The mono audio signal.
+        frame_length (int): The number of samples per frame.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: The energy in dB and the zero-crossing rate of each frame.
+    """
+    n_frames = len(audio) // frame_length
+    frames = audio[: n_frames * frame_length].reshape(n_frames, frame_length)
+    energy = 10 * np.log10((frames.astype(np.float64) ** 2).mean(axis=1) + 1e-10)
+    signs = np.signbit(frames)
+    zcr = (signs[:, 1:] != signs[:, :-1]).mean(axis=1)
+    return energy, zcr
+
+
+def _runs(mask):
+    # start (inclusive) and end (exclusive) indices of the runs of True in a boolean array
+    edges = np.diff(np.concatenate([[0], mask.astype(np.int8), [0]]))
+    return np.flatnonzero(edges == 1), np.flatnonzero(edges == -1)
+
+
+def detect_speech(
+    audio,
+    sample_rate=SAMPLE_RATE,
+    frame_length=0.03,
+    high_threshold=12.0,
+    low_threshold=6.0,
+    min_energy=-60.0,
+    max_zcr=0.4,
+    min_speech=0.25,
+    min_silence=0.5,
+    padding=0.2,
+):
+    """
+    Detects regions of speech using frame energy and zero-crossing rate with hysteresis.
+
+    Thresholds are relative to the noise floor, estimated as the 10th percentile of the
+    frame energies. A region starts at frames exceeding `high_threshold` whose zero-crossing
+    rate is not noise-like and extends while the energy stays above `low_threshold`.
+    Regions separated by short pauses are merged, very short regions are dropped, and
+    the remaining regions are padded on both sides.
+
+    Args:
+        audio (np.ndarray): The mono audio signal.
+        sample_rate (int): The sample rate of the audio.
+        frame_length (float): The length of the analysis frames in seconds.
+        high_threshold (float): The energy above the noise floor in dB that starts a region.
+        low_threshold (float): The energy above the noise floor in dB that sustains a region.
+        min_energy (float): The absolute energy in dB below which frames are always silent.
+        max_zcr (float): The zero-crossing rate above which quiet frames are treated as noise.
+        min_speech (float): The minimum length of a region in seconds.
+        min_silence (float): The minimum length of a pause between two regions in seconds.
+        padding (float): The padding added to both sides of each region in seconds.
+
+    Returns:
+        list[tuple[int, int]]: The start and end sample of each speech region.
+    """
+    frame = max(1, int(frame_length * sample_rate))
+    energy, zcr = frame_features(audio, frame)
+    if len(energy) == 0:
+        return []
+
+    floor = np.percentile(energy, 10)
+    if energy.max() - floor < high_threshold:
+        # without a distinct noise floor, speech and silence cannot be told apart
+        return [(0, len(audio))] if energy.max() >= min_energy else []
+
+    sustain = (energy >= floor + low_threshold) & (energy >= min_energy)
+    trigger = sustain & (energy >= floor + high_threshold) & (zcr <= max_zcr)
+
+    starts, ends = _runs(sustain)
+    if len(starts) == 0:
+        return []
+    triggered = np.add.reduceat(trigger.astype(np.int32), starts) > 0
+    starts, ends = starts[triggered], ends[triggered]
+    if len(starts) == 0:
+        return []
+
+    # merge regions separated by pauses shorter than min_silence
+    gap = int(np.ceil(min_silence * sample_rate / frame))
+    keep = np.concatenate([[True], starts[1:] - ends[:-1] >= gap])
+    starts = starts[keep]
+    ends = ends[np.concatenate([keep[1:], [True]])]
+
+    length = ends - starts
+    keep = length * frame >= min_speech * sample_rate
+    starts, ends = starts[keep] * frame, ends[keep] * frame
+
+    pad = int(padding * sample_rate)
+    starts = np.maximum(starts - pad, 0)
+    ends = np.minimum(ends + pad, len(audio))
+
+    # padding may make neighbouring regions overlap again
+    regions = []
+    for start, end in zip(starts.tolist(), ends.tolist()):
+        if regions and start <= regions[-1][1]:
+            regions[-1] = (regions[-1][0], max(end, regions[-1][1]))
+        else:
+            regions.append((start, end))
+    return regions
+
+
+def remove_silence(audio, regions):
+    """
+    Concatenates the speech regions of the audio.
+
+    Args:
+        audio (np.ndarray): The mono audio signal.
+        regions (list[tuple[int, int]]): The start and end sample of each speech region.
+
+    Returns:
+        np.ndarray: The audio without the non-speech parts.
+    """
+    if not regions:
+        return audio[:0]
+    return np.concatenate([audio[start:end] for start, end in regions])
+
+
+def remap_segments(segments, regions, sample_rate=SAMPLE_RATE):
+    """
+    Maps timestamps of the audio without silence back to the original timeline.
+
+    Args:
+        segments (list[dict]): The segments transcribed from the output of `remove_silence`.
+        regions (list[tuple[int, int]]): The speech regions passed to `remove_silence`.
+        sample_rate (int): The sample rate of the audio.
+
+    Returns:
+        list[dict]: The segments (and their words) with timestamps of the original audio.
+    """
+    if not regions:
+        return segments
+
+    original = np.array([start for start, _ in regions], dtype=np.float64) / sample_rate
+    lengths = np.array([end - start for start, end in regions]) / sample_rate
+    compressed = np.concatenate([[0.0], np.cumsum(lengths)[:-1]])
+
+    def remap(t, is_end):
+        # an end time on a region boundary belongs to the region before it
+        side = "left" if is_end else "right"
+        i = max(int(np.searchsorted(compressed, t, side=side)) - 1, 0)
+        return float(original[i] + t - compressed[i])
+
+    remapped = []
+    for segment in segments:
+        segment = dict(
+            segment,
+            start=remap(segment["start"], False),
+            end=remap(segment["end"], True),
+        )
+        if "words" in segment:
+            segment["words"] = [
+                dict(w, start=remap(w["start"], False), end=remap(w["end"], True))
+                for w in segment["words"]
+            ]
+        remapped.append(segment)
+    return remapped